@@ -7,6 +7,7 @@ load_dotenv()
 
 # Runtime configuration
 TURN_DELAY = 2  # Delay between turns (in seconds)
+MAX_WORKER_THREADS = 4  # Upper bound on concurrent AI worker threads
 SHOW_CHAIN_OF_THOUGHT_IN_CONTEXT = False  # Set to True to include Chain of Thought in conversation history
 SHARE_CHAIN_OF_THOUGHT = False  # Set to False so other AI doesn't see reasoning (prevents format mimicking)
 
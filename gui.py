@@ -3,23 +3,21 @@
 import os
 import json
 import requests
-import threading
 import math
-import random
 from datetime import datetime
-from io import BytesIO
-from PIL import Image
-import time
 from pathlib import Path
-import uuid
-import shutil
 import networkx as nx
+import numpy as np
 import re
-import sys
-import webbrowser
-from PyQt6.QtCore import Qt, QRect, QTimer, QRectF, QPointF, QSize, pyqtSignal, QEvent, QPropertyAnimation, QEasingCurve
-from PyQt6.QtGui import QFont, QColor, QPainter, QPen, QBrush, QFontDatabase, QTextCursor, QAction, QKeySequence, QTextCharFormat, QLinearGradient, QRadialGradient, QPainterPath, QImage, QPixmap
-from PyQt6.QtWidgets import QWidget, QApplication, QMainWindow, QSplitter, QVBoxLayout, QHBoxLayout, QTextEdit, QFrame, QLineEdit, QPushButton, QLabel, QComboBox, QMenu, QFileDialog, QMessageBox, QScrollArea, QToolTip, QSizePolicy, QCheckBox
+from html import escape
+from collections import deque, OrderedDict
+from functools import lru_cache
+from contextlib import contextmanager
+from itertools import groupby
+from operator import itemgetter
+from PyQt6.QtCore import Qt, QLine, QRect, QTimer, QRectF, QPointF, QSize, pyqtSignal, pyqtSlot, QEvent, QPropertyAnimation, QEasingCurve, QObject, QRunnable, QThreadPool, QBuffer, QByteArray, QIODevice, QUrl
+from PyQt6.QtGui import QFont, QColor, QPainter, QPen, QBrush, QFontDatabase, QTextCursor, QAction, QKeySequence, QTextCharFormat, QLinearGradient, QRadialGradient, QPainterPath, QRegion, QTransform, QImage, QImageReader, QPixmap, QTextDocument, QTextDocumentFragment
+from PyQt6.QtWidgets import QWidget, QApplication, QMainWindow, QSplitter, QVBoxLayout, QHBoxLayout, QTextEdit, QFrame, QLineEdit, QPushButton, QLabel, QComboBox, QMenu, QFileDialog, QMessageBox, QScrollArea, QToolTip, QSizePolicy, QCheckBox, QGraphicsColorizeEffect
 
 from config import (
     AI_MODELS,
@@ -30,6 +28,11 @@ from config import (
 # Add import for the HTML viewing functionality 
 from shared_utils import open_html_in_browser, generate_image_from_text
 
+try:
+    import numba
+except ImportError:  # optional - physics falls back to vectorized NumPy
+    numba = None
+
 # Define global color palette for consistent styling
 COLORS = {
     'bg_dark': '#1E1E1E',           # Main background
@@ -53,6 +56,163 @@ COLORS = {
     'system_message': '#CE9178',    # System messages
 }
 
+# Style shared by every selector combobox - built once, and part of the window's theme
+# stylesheet so the comboboxes inherit it instead of each parsing its own copy
+COMBOBOX_STYLE = f"""
+    QComboBox {{
+        background-color: {COLORS['bg_light']};
+        color: {COLORS['text_normal']};
+        border: 1px solid {COLORS['border']};
+        border-radius: 4px;
+        padding: 5px 10px;
+        min-width: 150px;
+    }}
+    QComboBox::drop-down {{
+        subcontrol-origin: padding;
+        subcontrol-position: top right;
+        width: 20px;
+        border-left: 1px solid {COLORS['border']};
+        border-top-right-radius: 4px;
+        border-bottom-right-radius: 4px;
+    }}
+    QComboBox::down-arrow {{
+        width: 12px;
+        height: 12px;
+        image: none;
+    }}
+    QComboBox QAbstractItemView {{
+        background-color: {COLORS['bg_medium']};
+        color: {COLORS['text_normal']};
+        selection-background-color: {COLORS['accent_blue']};
+        selection-color: {COLORS['text_bright']};
+        border: 1px solid {COLORS['border']};
+        border-radius: 0px;
+    }}
+"""
+
+# Upper bound on inline image references kept alive by the conversation pane.
+# Older pixmaps fall off the ring and are released; paths are cheap, so keep more.
+MAX_RETAINED_IMAGES = 32
+MAX_RETAINED_IMAGE_PATHS = 256
+
+# Selector entries, computed once from config and shared by every combobox that lists them
+MODEL_NAMES = list(AI_MODELS)
+PROMPT_PAIR_NAMES = list(SYSTEM_PROMPT_PAIRS)
+
+# Decoded images kept for redisplay without decoding again
+MAX_CACHED_IMAGES = 64
+
+# Rendered conversation HTML documents kept for reuse when switching between branches
+MAX_CACHED_RENDERS = 16
+
+# Formatted message bodies kept, by content, so unchanged messages aren't reprocessed on re-render
+MAX_CACHED_CONTENT = 512
+
+# Rendered HTML of individual messages kept, so a re-render only builds the ones that changed
+MAX_CACHED_MESSAGES = 1024
+
+# Opening user prompt for each branch type, filled with the selected text
+BRANCH_PROMPT_TEMPLATES = {
+    'rabbithole': "Let's explore and expand upon the concept of '{selected_text}' from our previous discussion.",
+    'fork': "Complete this thought or sentence naturally, continuing forward from exactly this point: '{selected_text}'",
+}
+
+# Propagate button: its normal style, and its style while loading (pulsed by a colorize effect)
+SUBMIT_BUTTON_STYLE = f"""
+    QPushButton {{
+        background-color: {COLORS['accent_blue']};
+        color: {COLORS['text_bright']};
+        border: none;
+        border-radius: 4px;
+        padding: 4px 12px;
+        font-weight: bold;
+        font-size: 11px;
+    }}
+    QPushButton:hover {{
+        background-color: {COLORS['accent_blue_hover']};
+    }}
+    QPushButton:pressed {{
+        background-color: {COLORS['accent_blue_active']};
+    }}
+    QPushButton:disabled {{
+        background-color: {COLORS['border']};
+        color: {COLORS['text_dim']};
+    }}
+"""
+SUBMIT_BUTTON_LOADING_STYLE = f"""
+    QPushButton {{
+        background-color: {COLORS['border']};
+        color: {COLORS['text_dim']};
+        border: none;
+        border-radius: 4px;
+        padding: 4px 12px;
+        font-weight: bold;
+        font-size: 11px;
+    }}
+"""
+
+# Style block heading every rendered conversation - COLORS is fixed, so it is formatted once
+CONVERSATION_STYLE = (
+    "<style>"
+    f"body {{ font-family: 'Segoe UI', sans-serif; font-size: 10pt; line-height: 1.4; }}"
+    f".message {{ margin-bottom: 10px; padding: 8px; border-radius: 4px; }}"
+    f".user {{ background-color: {COLORS['bg_medium']}; }}"
+    f".assistant {{ background-color: {COLORS['bg_medium']}; }}"
+    f".system {{ background-color: {COLORS['bg_medium']}; font-style: italic; }}"
+    f".header {{ font-weight: bold; margin: 10px 0; color: {COLORS['accent_blue']}; }}"
+    f".content {{ white-space: pre-wrap; color: {COLORS['text_normal']}; }}"
+    f".branch-indicator {{ color: {COLORS['text_dim']}; font-style: italic; text-align: center; margin: 8px 0; }}"
+    f".rabbithole {{ color: {COLORS['accent_green']}; }}"
+    f".fork {{ color: {COLORS['accent_yellow']}; }}"
+    f".cot-label {{ font-weight: bold; color: {COLORS['chain_of_thought']}; margin-top: 6px; }}"
+    f".cot-body {{ color: {COLORS['chain_of_thought']}; margin-top: 4px; white-space: pre-wrap; }}"
+    f".cot-final {{ margin-top: 6px; white-space: pre-wrap; }}"
+    f".cot-container {{ background-color: {COLORS['bg_dark']}; border-left: 3px solid {COLORS['chain_of_thought']}; padding: 8px; border-radius: 4px; margin-top: 8px; }}"
+    # Removed HTML contribution styling
+    f"pre {{ background-color: {COLORS['bg_dark']}; border: 1px solid {COLORS['border']}; border-radius: 3px; padding: 8px; overflow-x: auto; margin: 8px 0; }}"
+    f"code {{ font-family: 'Consolas', 'Courier New', monospace; color: {COLORS['text_bright']}; }}"
+    "</style>"
+)
+
+# Complete document around the conversation markup, for the HTML export
+EXPORT_HTML_TEMPLATE = (
+    '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+    '<title>Liminal Backrooms Conversation</title>\n{style}\n</head>\n'
+    f"<body style=\"background-color: {COLORS['bg_dark']};\">\n"
+    "{body}\n</body>\n</html>\n"
+)
+
+# Markup patterns for conversation rendering and export, compiled once
+CODE_BLOCK_RE = re.compile(r'(```(?:[a-zA-Z0-9_]*)\n.*?```)', re.DOTALL)
+CODE_BLOCK_LANG_RE = re.compile(r'```([a-zA-Z0-9_]*)\n')
+INLINE_CODE_RE = re.compile(r'(`[^`]+`)')
+
+# Markup around the content of user and system messages
+MESSAGE_OPEN_HTML = {
+    'user': '<div class="message user"><div class="content">',
+    'system': '<div class="message system"><div class="content">',
+}
+MESSAGE_CLOSE_HTML = '</div></div>'
+
+# Network node appearance by type: fill color, size (area-like; radius is its sqrt) and how far
+# out new nodes are placed, as a multiple of the base ring distance. Unknown types use 'branch'.
+NODE_TYPE_PROPS = {
+    'main': {'color': '#569CD6', 'size': 800, 'distance': 0.0},        # Blue, at the center
+    'rabbithole': {'color': '#B5CEA8', 'size': 600, 'distance': 1.0},  # Green
+    'fork': {'color': '#DCDCAA', 'size': 600, 'distance': 1.2},        # Yellow
+    'branch': {'color': '#CE9178', 'size': 400, 'distance': 1.4},      # Orange
+}
+
+# Transcript blocks (paragraphs) kept in the display; older ones are dropped from the top
+MAX_TEXT_BLOCKS = 5000
+
+# Submit button labels cycled while a turn is processing
+LOADING_FRAMES = tuple(f"Processing{'.' * dots}" for dots in range(4))
+
+# Branches whose derived data (rendered HTML, path label) stays cached; past this, the least
+# recently used release it - their conversations are always kept whole
+MAX_WARM_BRANCHES = 32
+
 # Load custom fonts
 def load_fonts():
     """Load custom fonts for the application"""
@@ -75,6 +235,331 @@ def load_fonts():
     
     return loaded_fonts
 
+def _truncate(text, limit):
+    """Return text cut to limit characters with an ellipsis if it was longer"""
+    return text if len(text) <= limit else text[:limit] + '...'
+
+@lru_cache(maxsize=MAX_CACHED_CONTENT)
+def _format_content(content):
+    """Escape message content and mark up its code blocks and inline code as HTML
+    
+    Cached by content: re-rendering a conversation reprocesses mostly unchanged messages.
+    """
+    # First, escape HTML in the content
+    escaped_content = escape(content)
+    
+    # Check if there are any code blocks in the content
+    if "```" not in escaped_content:
+        return escaped_content
+    
+    # Split the content by code block markers
+    parts = CODE_BLOCK_RE.split(escaped_content)
+    
+    result = []
+    for part in parts:
+        if part.startswith("```") and part.endswith("```"):
+            # This is a code block
+            try:
+                # Extract language if specified
+                language_match = CODE_BLOCK_LANG_RE.match(part)
+                language = language_match.group(1) if language_match else ""
+                
+                # Extract code content
+                code_content = part[part.find('\n')+1:part.rfind('```')]
+                
+                # Format as HTML
+                formatted_code = f'<pre><code class="language-{language}">{code_content}</code></pre>'
+                result.append(formatted_code)
+            except Exception as e:
+                # If there's an error, just add the original escaped content
+                print(f"Error processing code block: {e}")
+                result.append(part)
+        elif "`" not in part:
+            # Plain text between code blocks - nothing to split
+            result.append(part)
+        else:
+            # Process inline code in non-code-block parts, straight into the result
+            inline_parts = INLINE_CODE_RE.split(part)
+            
+            for inline_part in inline_parts:
+                if inline_part.startswith("`") and inline_part.endswith("`") and len(inline_part) > 2:
+                    # This is inline code
+                    code = inline_part[1:-1]
+                    result.append(f'<code>{code}</code>')
+                else:
+                    result.append(inline_part)
+    
+    return ''.join(result)
+
+class BackgroundTaskSignals(QObject):
+    """Signals emitted by a BackgroundTask, delivered on the GUI thread"""
+    result = pyqtSignal(object)
+    error = pyqtSignal(object)
+
+class BackgroundTask(QRunnable):
+    """Run a blocking callable on the global QThreadPool and report back via signals"""
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = BackgroundTaskSignals()
+    
+    @pyqtSlot()
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.error.emit(e)
+        else:
+            self.signals.result.emit(result)
+
+def _write_export(file_name, content=None, source_path=None):
+    """Write content to an export file, or copy source_path to it - safe off the GUI thread"""
+    if source_path is not None:
+        import shutil
+        shutil.copy2(source_path, file_name)
+    else:
+        with open(file_name, 'w', encoding='utf-8') as f:
+            f.write(content)
+    return file_name
+
+# Shared HTTP session for image downloads - keeps connections (and TLS sessions) alive between images
+_http_session = None
+
+def _get_http_session():
+    """Return the shared image-download session, creating it on first use"""
+    global _http_session
+    if _http_session is None:
+        _http_session = requests.Session()
+        _http_session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    return _http_session
+
+def close_http_session():
+    """Close the shared image-download session, if one was opened"""
+    global _http_session
+    if _http_session is not None:
+        _http_session.close()
+        _http_session = None
+
+class ImageLoadError(Exception):
+    """Raised when an image can't be found or decoded"""
+
+def _load_image(source, max_width, image_data=None):
+    """Load and downscale an image off the GUI thread, returning (image, local_path)"""
+    # Downloads are decoded straight from memory; the bytes are also saved under images/
+    if image_data is None and source.startswith(('http://', 'https://')):
+        response = _get_http_session().get(source, timeout=(3.05, 30))
+        response.raise_for_status()
+        image_data = response.content
+        source = _save_downloaded_image(source, image_data)
+    
+    if image_data is not None:
+        buffer = QBuffer()
+        buffer.setData(QByteArray(image_data))
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        reader = QImageReader(buffer)
+    elif not os.path.exists(source):
+        raise ImageLoadError("Image not found")
+    else:
+        reader = QImageReader(source)
+    
+    # Decode directly at display size when the header gives us dimensions -
+    # JPEG scales during DCT decoding, so oversized sources are never fully decoded
+    size = reader.size()
+    if size.isValid() and size.width() > max_width:
+        reader.setScaledSize(QSize(max_width, max(1, size.height() * max_width // size.width())))
+    image = reader.read()
+    
+    if image.isNull():
+        raise ImageLoadError("Invalid image format")
+    
+    # Scale the image to fit the conversation display (formats that don't report their size up front)
+    if image.width() > max_width:
+        image = image.scaledToWidth(max_width, Qt.TransformationMode.SmoothTransformation)
+    # Convert once here, off the GUI thread, to the format the raster painter blits without conversion
+    if image.hasAlphaChannel():
+        image = image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+    else:
+        image = image.convertToFormat(QImage.Format.Format_RGB32)
+    return image, source
+
+def _save_downloaded_image(url, image_data):
+    """Persist downloaded image bytes under images/, returning the local path (or the URL on failure)"""
+    try:
+        image_dir = Path("images")
+        image_dir.mkdir(exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        extension = Path(url.split('?', 1)[0]).suffix or ".png"
+        image_path = image_dir / f"downloaded_{timestamp}{extension}"
+        with open(image_path, "wb") as f:
+            f.write(image_data)
+        return str(image_path)
+    except OSError as e:
+        print(f"Could not save downloaded image: {e}")
+        return url
+
+def _physics_step(pos, vel, radii, all_pairs, first, second, edge_src, edge_dst, repulsion, attraction,
+                  damping, movable):
+    """One collision-dynamics step over the SoA arrays, updating vel and pos in place
+    
+    Repulsion is tested for every pair of nodes if all_pairs, otherwise only for the ordered
+    candidate pairs (first[k], second[k]), e.g. from a spatial hash.
+    """
+    n = pos.shape[0]
+    force = np.zeros_like(vel)
+    
+    # Repulsion, stronger when closer, zero beyond the sum of radii
+    if all_pairs:
+        for i in range(n):
+            fx = 0.0
+            fy = 0.0
+            for j in range(n):
+                if i == j:
+                    continue
+                dx = pos[i, 0] - pos[j, 0]
+                dy = pos[i, 1] - pos[j, 1]
+                distance = max(0.1, math.sqrt(dx * dx + dy * dy))
+                reach = radii[i] + radii[j]
+                if distance < reach:
+                    strength = repulsion * (1.0 - distance / reach)
+                    fx += dx / distance * strength
+                    fy += dy / distance * strength
+            force[i, 0] = fx
+            force[i, 1] = fy
+    else:
+        for k in range(first.shape[0]):
+            i = first[k]
+            j = second[k]
+            dx = pos[i, 0] - pos[j, 0]
+            dy = pos[i, 1] - pos[j, 1]
+            distance = max(0.1, math.sqrt(dx * dx + dy * dy))
+            reach = radii[i] + radii[j]
+            if distance < reach:
+                strength = repulsion * (1.0 - distance / reach)
+                force[i, 0] += dx / distance * strength
+                force[i, 1] += dy / distance * strength
+    
+    # Attraction along edges, pulling both ends together
+    for k in range(edge_src.shape[0]):
+        a = edge_src[k]
+        b = edge_dst[k]
+        dx = pos[b, 0] - pos[a, 0]
+        dy = pos[b, 1] - pos[a, 1]
+        distance = max(0.1, math.sqrt(dx * dx + dy * dy))
+        px = dx / distance * attraction
+        py = dy / distance * attraction
+        force[a, 0] += px
+        force[a, 1] += py
+        force[b, 0] -= px
+        force[b, 1] -= py
+    
+    # Damp, then move everything but pinned nodes
+    for i in range(n):
+        vel[i, 0] = (vel[i, 0] + force[i, 0]) * damping
+        vel[i, 1] = (vel[i, 1] + force[i, 1]) * damping
+        if movable[i]:
+            pos[i, 0] += vel[i, 0]
+            pos[i, 1] += vel[i, 1]
+
+# Shared noise table for the mycelial cosmetics; each edge/node reads its own stable run of it
+NOISE_SIZE = 1 << 16
+NOISE_MASK = NOISE_SIZE - 1
+
+class _SpatialHash:
+    """Uniform grid bucketing points by cell, for neighbourhood queries without scanning every point"""
+    # Cell rows are packed into one integer key per cell: column * _ROW_SPAN + row
+    _ROW_SPAN = 1 << 21
+    
+    def __init__(self):
+        self.cell = 64.0
+        self._cols = np.zeros(0, dtype=np.int64)
+        self._rows = np.zeros(0, dtype=np.int64)
+        self._order = np.zeros(0, dtype=np.intp)
+        self._sorted_keys = np.zeros(0, dtype=np.int64)
+    
+    def rebuild(self, xs, ys, cell):
+        """Bucket points by cell; neighbours within `cell` of a point are in its 3x3 block"""
+        self.cell = cell
+        self._cols = np.floor_divide(xs, cell).astype(np.int64)
+        self._rows = np.floor_divide(ys, cell).astype(np.int64)
+        keys = self._cols * self._ROW_SPAN + self._rows
+        self._order = np.argsort(keys, kind='stable')
+        self._sorted_keys = keys[self._order]
+    
+    def near(self, x, y):
+        """Indices of points in the 3x3 block of cells around (x, y)"""
+        cx = int(x // self.cell)
+        cy = int(y // self.cell)
+        # The three cells of a column are consecutive keys, so each column is one sorted run
+        columns = np.arange(cx - 1, cx + 2) * self._ROW_SPAN
+        lo = np.searchsorted(self._sorted_keys, columns + (cy - 1), side='left')
+        hi = np.searchsorted(self._sorted_keys, columns + (cy + 1), side='right')
+        return np.concatenate([self._order[start:end] for start, end in zip(lo.tolist(), hi.tolist(), strict=True)])
+    
+    def pairs(self):
+        """Index arrays (i, j) of all ordered pairs i != j in the same or adjacent cells"""
+        n = len(self._order)
+        points = np.arange(n)
+        firsts = []
+        seconds = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                # Range of sorted points in each point's neighbouring cell (dx, dy)
+                keys = (self._cols + dx) * self._ROW_SPAN + (self._rows + dy)
+                lo = np.searchsorted(self._sorted_keys, keys, side='left')
+                counts = np.searchsorted(self._sorted_keys, keys, side='right') - lo
+                total = int(counts.sum())
+                if not total:
+                    continue
+                # Expand each point's range into (point, neighbour) pairs
+                offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+                firsts.append(np.repeat(points, counts))
+                seconds.append(self._order[np.repeat(lo, counts) + offsets])
+        if not firsts:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+        first = np.concatenate(firsts)
+        second = np.concatenate(seconds)
+        distinct = first != second
+        return first[distinct], second[distinct]
+
+# Above this many nodes the physics only tests pairs from neighbouring grid cells
+SPATIAL_HASH_MIN_NODES = 64
+
+# Compiled when numba is installed - on the thread pool, see warm_physics_kernel(). Until it is
+# ready (or without numba) apply_collision_dynamics uses the NumPy path.
+_physics_jit = numba.njit(fastmath=True, cache=True)(_physics_step) if numba is not None else None
+_physics_kernel = None
+_physics_warmup = None  # The BackgroundTask compiling the kernel, once started
+_physics_pool = None  # Its own pool, so exiting can wait for it without waiting on downloads
+
+def _compile_physics_kernel():
+    """Compile the physics kernel by stepping a two-node graph with the widget's array types"""
+    no_pairs = np.zeros(0, dtype=np.intp)
+    _physics_jit(np.eye(2), np.zeros((2, 2)), np.ones(2), True, no_pairs, no_pairs, no_pairs, no_pairs,
+                 0.5, 0.1, 0.8, np.ones(2, dtype=bool))
+    return _physics_jit
+
+def _on_physics_kernel_ready(kernel):
+    """Switch the physics over to the compiled kernel"""
+    global _physics_kernel
+    _physics_kernel = kernel
+
+def warm_physics_kernel():
+    """Start compiling the physics kernel in the background, so the first animation tick doesn't block on it"""
+    global _physics_warmup, _physics_pool
+    if _physics_jit is None or _physics_warmup is not None:
+        return
+    _physics_warmup = BackgroundTask(_compile_physics_kernel)
+    _physics_warmup.signals.result.connect(_on_physics_kernel_ready)
+    _physics_warmup.signals.error.connect(lambda error: print(f"Physics kernel unavailable, using NumPy: {error}"))
+    _physics_pool = QThreadPool()
+    _physics_pool.start(_physics_warmup)
+
+def wait_for_physics_kernel():
+    """Block until a started kernel compile has finished, so it doesn't outlive the application"""
+    if _physics_pool is not None:
+        _physics_pool.waitForDone()
+
 class NetworkGraphWidget(QWidget):
     nodeSelected = pyqtSignal(str)
     nodeHovered = pyqtSignal(str)
@@ -85,10 +570,13 @@ class NetworkGraphWidget(QWidget):
         # Graph data
         self.nodes = []
         self.edges = []
+        self._edge_set = set()  # Membership index over self.edges - see _edge_lookup()
+        self._edge_set_key = (id(self.edges), 0)
         self.node_positions = {}
         self.node_colors = {}
         self.node_labels = {}
         self.node_sizes = {}
+        self.node_types = {}
         
         # Edge animation data
         self.growing_edges = {}  # Dictionary to track growing edges: {(source, target): growth_progress}
@@ -99,9 +587,17 @@ class NetworkGraphWidget(QWidget):
         self.selected_node = None
         self.hovered_node = None
         self.animation_progress = 0
+        self.active_interval = 50  # 20 FPS while something is moving
+        self.idle_interval = 500  # Slow tick once the layout has settled
+        self.idle_velocity = 0.01  # Max node speed (px/frame) still considered settled
+        self.physics_every = 2  # Physics steps on every other tick (10 Hz); paint interpolates in between
+        self._ticks_since_step = self.physics_every
+        self.animations_paused = False
+        self._update_pending = False  # A coalesced wake + redraw is already queued
+        self._update_nodes = set()  # Nodes whose area it will repaint; None for the whole widget
         self.animation_timer = QTimer(self)
         self.animation_timer.timeout.connect(self.update_animation)
-        self.animation_timer.start(50)  # 20 FPS animation
+        self.animation_timer.start(self.active_interval)
         
         # Mycelial node settings
         self.hyphae_count = 5  # Number of hyphae per node
@@ -115,29 +611,235 @@ class NetworkGraphWidget(QWidget):
             'fork': '#F2C14E',  # Soft yellow
             'branch': '#F78154'   # Soft orange
         }
+        # Tooltip emoji by node type (main and plain branches use the seedling)
+        self.node_emoji_by_type = {
+            'rabbithole': '🕳️',
+            'fork': '🔱'
+        }
         
         # Collision dynamics
-        self.node_velocities = {}  # Store velocities for each node
+        # Physics state as structure-of-arrays, row i <-> self._physics_ids[i]; built from the
+        # position/size dicts, and extended in place as nodes and edges are appended
+        self._physics_key = None
+        self._physics_ids = []
+        self._node_index = {}
+        self._pos = np.zeros((0, 2))
+        self._pos_prev = np.zeros((0, 2))  # Positions before the last step, for interpolation
+        self._vel = np.zeros((0, 2))
+        self._radii = np.zeros(0)
+        self._movable = np.zeros(0, dtype=bool)
+        self._edge_src = np.zeros(0, dtype=np.intp)
+        self._edge_dst = np.zeros(0, dtype=np.intp)
+        self._edge_keys = []
+        self._edge_index = {}  # (source, target) -> row in the edge arrays
+        self._physics_buffers = {}  # Array name -> buffer with spare rows that the array is a view of
+        warm_physics_kernel()  # Compiled off the GUI thread; NumPy physics until then
+        # Set when the simulation moved nodes that node_positions doesn't reflect yet
+        self._positions_dirty = False
+        # Node indices bucketed by graph position (cell >= the largest interaction reach)
+        self._spatial_hash = _SpatialHash()
+        self._spatial_hash_stale = True
         self.repulsion_strength = 0.5  # Strength of repulsion between nodes
         self.attraction_strength = 0.1  # Strength of attraction along edges
         self.damping = 0.8  # Damping factor to prevent oscillation
         self.apply_physics = True  # Toggle for physics simulation
         
+        # Precomputed jitter (a list - scalar indexing is cheaper than on an ndarray) and
+        # per-edge/per-node offsets into it, so shapes don't re-randomize every frame
+        self._noise = np.random.default_rng().random(NOISE_SIZE).tolist()
+        self._noise_offsets = {}
+        self._node_shapes = {}  # node_id -> (body path, hyphae), unit radius - see _node_shape()
+        
+        # Paint objects reused across frames instead of reallocated per filament/hypha
+        self._color_cache = {}  # (color name, alpha) -> QColor
+        self._shade_cache = {}  # color name -> (lighter, base, darker) for node fills
+        
+        # Static part of the picture (background, grid, edge filaments), redrawn only when the
+        # layout moves; the flow highlight is drawn on top each frame along _flow_paths
+        self._edge_layer = None
+        self._edge_layer_key = None
+        self._edge_layer_pos = np.zeros((0, 2))
+        self._flow_paths = []  # (filament path, phase offset)
+        self.flow_glow_radius = 4.0
+        flow_gradient = QRadialGradient(QPointF(0, 0), self.flow_glow_radius)
+        flow_gradient.setColorAt(0, QColor(255, 255, 255, 100))
+        flow_gradient.setColorAt(1, QColor(255, 255, 255, 0))
+        self._flow_brush = QBrush(flow_gradient)
+        self._stroke_pen = QPen()
+        self._stroke_pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+        
+        # Background and subtle grid lines, sized in resizeEvent
+        self._grid_pen = QPen(QColor(COLORS['border']).darker(150), 0.5, Qt.PenStyle.DotLine)
+        self._grid_size = 40
+        self._grid_lines = []
+        self._background = QLinearGradient()
+        
+        # Viewport culling - extra margin (px) so partially visible glows/hyphae still draw
+        self.cull_margin = 20
+        
+        # Debounced hover tooltip - rapid mouse motion across nodes doesn't thrash show/hide
+        self._tooltip_text = ""
+        self._tooltip_pos = None
+        self._tooltip_timer = QTimer(self)
+        self._tooltip_timer.setSingleShot(True)
+        self._tooltip_timer.setInterval(300)
+        self._tooltip_timer.timeout.connect(self.show_hover_tooltip)
+        
         # Set up the widget
         self.setMinimumSize(300, 300)
         self.setMouseTracking(True)
         
+    def _edge_lookup(self):
+        """Set of current edges, re-indexed if self.edges was replaced or extended elsewhere"""
+        key = (id(self.edges), len(self.edges))
+        if key != self._edge_set_key:
+            self._edge_set = set(self.edges)
+            self._edge_set_key = key
+        return self._edge_set
+    
     def add_edge(self, source, target):
         """Add an edge with growth animation"""
-        if (source, target) not in self.edges:
-            self.edges.append((source, target))
+        edge = (source, target)
+        edge_set = self._edge_lookup()
+        if edge not in edge_set:
+            edge_set.add(edge)
+            self.edges.append(edge)
+            self._edge_set_key = (id(self.edges), len(self.edges))
             # Initialize edge growth at 0
-            self.growing_edges[(source, target)] = 0.0
-            # Force update to start animation immediately
+            self.growing_edges[edge] = 0.0
+            # Start the animation on the next event-loop turn
+            self.schedule_update((source, target))
+    
+    def node_update_rect(self, node_id):
+        """Widget area a node (glow and hyphae included) can paint into; null if it has no position yet"""
+        i = self._node_index.get(node_id)
+        if i is not None:
+            position, radius = self._pos[i].tolist(), float(self._radii[i])
+        else:
+            position = self.node_positions.get(node_id)
+            if position is None:
+                return QRect()
+            radius = math.sqrt(self.node_sizes.get(node_id, 400))
+        transform = self._view_transform()
+        center = transform.map(QPointF(*position))
+        # Same reach as the viewport culling in paintEvent
+        extent = radius * transform.m11() + self.cull_margin
+        return QRectF(center.x() - extent, center.y() - extent, 2 * extent, 2 * extent).toAlignedRect()
+    
+    def schedule_update(self, node_ids=None):
+        """Wake the animation and redraw once, however many nodes/edges arrive in this event-loop turn
+        
+        With node_ids only the area around those nodes is repainted (accumulated across calls and
+        worked out once, when the update runs); without, everything.
+        """
+        if node_ids is None:
+            self._update_nodes = None
+        elif self._update_nodes is not None:
+            self._update_nodes.update(node_ids)
+        if not self._update_pending:
+            self._update_pending = True
+            QTimer.singleShot(0, self._flush_update)
+    
+    def _flush_update(self):
+        node_ids = self._update_nodes
+        self._update_pending = False
+        self._update_nodes = set()
+        self.wake_animation()
+        rect = self._nodes_rect(node_ids or ())
+        if rect.isNull():
             self.update()
+        else:
+            self.update(rect)
+    
+    def _nodes_rect(self, node_ids):
+        """Union of the update rects of the given nodes (None entries are skipped)"""
+        rect = QRect()
+        for node_id in node_ids:
+            if node_id is not None:
+                rect = rect.united(self.node_update_rect(node_id))
+        return rect
+    
+    def update_nodes(self, *node_ids):
+        """Repaint only around the given nodes, e.g. when their hover or selection state changes
+        
+        No edge joins them, so each node's own rect is repainted rather than the rect spanning
+        all of them (the previously and newly hovered nodes can be far apart).
+        """
+        region = QRegion()
+        for node_id in node_ids:
+            if node_id is not None:
+                region += self.node_update_rect(node_id)
+        if not region.isEmpty():
+            self.update(region)
+        
+    def resizeEvent(self, event):
+        """Rebuild the size-dependent background gradient and grid lines"""
+        super().resizeEvent(event)
+        width = self.width()
+        height = self.height()
         
+        # Subtle vertical gradient
+        self._background = QLinearGradient(0, 0, 0, height)
+        self._background.setColorAt(0, QColor('#1A1A1E'))  # Dark blue-gray
+        self._background.setColorAt(1, QColor('#0F0F12'))  # Darker at bottom
+        
+        # Grid lines, drawn with a single drawLines call
+        grid_size = self._grid_size
+        self._grid_lines = ([QLine(x, 0, x, height) for x in range(0, width, grid_size)] +
+                            [QLine(0, y, width, y) for y in range(0, height, grid_size)])
+    
+    def _color(self, name, alpha):
+        """Shared QColor for a color name at the given alpha"""
+        color = self._color_cache.get((name, alpha))
+        if color is None:
+            color = self._color_cache[(name, alpha)] = QColor(name)
+            color.setAlpha(alpha)
+        return color
+    
+    def _shades(self, name):
+        """Shared (lighter, base, darker) QColors for a node fill gradient"""
+        shades = self._shade_cache.get(name)
+        if shades is None:
+            base = QColor(name)
+            shades = self._shade_cache[name] = (base.lighter(130), base, base.darker(130))
+        return shades
+    
+    def _noise_offset(self, key):
+        """Stable start index into the noise table for an edge or node"""
+        offset = self._noise_offsets.get(key)
+        if offset is None:
+            offset = self._noise_offsets[key] = hash(key) & NOISE_MASK
+        return offset
+    
+    def wake_animation(self):
+        """Return to the full frame rate, e.g. after the graph changed"""
+        if self.animation_timer.interval() != self.active_interval:
+            self.animation_timer.setInterval(self.active_interval)
+    
+    def set_animations_paused(self, paused):
+        """Stop animating (e.g. while the window is minimized)"""
+        self.animations_paused = paused
+        if paused:
+            self.animation_timer.stop()
+        elif self.isVisible():
+            self.animation_timer.start(self.active_interval)
+    
+    def showEvent(self, event):
+        """Resume animating when shown"""
+        super().showEvent(event)
+        if not self.animations_paused:
+            self.animation_timer.start(self.active_interval)
+    
+    def hideEvent(self, event):
+        """Nothing to animate while hidden"""
+        super().hideEvent(event)
+        self.animation_timer.stop()
+    
     def update_animation(self):
         """Update animation state"""
+        if not self.isVisible():
+            return
+        
         self.animation_progress = (self.animation_progress + 0.05) % 1.0
         
         # Update growing edges
@@ -158,148 +860,291 @@ class NetworkGraphWidget(QWidget):
                 self.growing_edges.pop(edge)
         
         # Apply collision dynamics if enabled
+        moving = False
         if self.apply_physics and len(self.nodes) > 1:
-            self.apply_collision_dynamics()
+            if self._ticks_since_step >= self.physics_every:
+                self._sync_physics_arrays()
+                self._pos_prev = self._pos.copy()
+                self.apply_collision_dynamics()
+                self._ticks_since_step = 0
+            self._ticks_since_step += 1
+            moving = self._vel.size > 0 and float(np.abs(self._vel).max()) >= self.idle_velocity
+        
+        # Drop to a slow tick once edges have grown in and the layout has settled
+        interval = self.active_interval if (has_growing_edges or moving) else self.idle_interval
+        if self.animation_timer.interval() != interval:
+            self.animation_timer.setInterval(interval)
         
         # Update the widget
         self.update()
     
+    def _sync_physics_arrays(self):
+        """Bring the physics arrays up to date if nodes, positions or edges were added since the last frame"""
+        key = (id(self.nodes), len(self.nodes), id(self.node_positions), len(self.node_positions),
+               id(self.edges), len(self.edges))
+        if key == self._physics_key:
+            return
+        if self._append_physics_rows(key):
+            return
+        if self._physics_key is not None and key[2] == self._physics_key[2]:
+            # Moved nodes must reach the dict before it is read back
+            self.publish_positions()
+        self._physics_key = key
+        
+        # Carry velocities over for nodes that were already simulated
+        old_velocities = {node_id: self._vel[i] for i, node_id in enumerate(self._physics_ids)}
+        
+        ids = [node_id for node_id in self.nodes if node_id in self.node_positions]
+        index = {node_id: i for i, node_id in enumerate(ids)}
+        self._physics_ids = ids
+        self._node_index = index
+        self._pos = np.array([self.node_positions[node_id] for node_id in ids], dtype=float).reshape(-1, 2)
+        self._vel = np.array([old_velocities.get(node_id, (0.0, 0.0)) for node_id in ids], dtype=float).reshape(-1, 2)
+        self._radii = np.sqrt(np.array([self.node_sizes.get(node_id, 400) for node_id in ids], dtype=float))
+        # The main node stays centered
+        self._movable = np.array([node_id != 'main' for node_id in ids], dtype=bool)
+        
+        edges = [(source, target) for source, target in self.edges
+                 if source in index and target in index and source != target]
+        self._edge_keys = edges
+        self._edge_index = {edge: k for k, edge in enumerate(edges)}
+        self._edge_src = np.array([index[source] for source, _ in edges], dtype=np.intp)
+        self._edge_dst = np.array([index[target] for _, target in edges], dtype=np.intp)
+        self._physics_buffers = {}
+        self._spatial_hash_stale = True
+    
+    def _append_physics_rows(self, key):
+        """Extend the physics arrays with nodes and edges appended since they were built
+        
+        Only possible when the same lists/dict grew and every node listed before was already
+        positioned, so the new rows land exactly where a rebuild would put them. Buffers
+        double in capacity, so adding a node costs amortized O(1) instead of an O(N) rebuild.
+        Returns False if the arrays need a full rebuild instead.
+        """
+        old = self._physics_key
+        if (old is None or key[0::2] != old[0::2] or key[1] < old[1] or key[5] < old[5]
+                or len(self._physics_ids) != old[1]):
+            return False
+        added = [node_id for node_id in self.nodes[old[1]:] if node_id in self.node_positions]
+        if len(self._physics_ids) + len(added) != len(self.node_positions):
+            # A node was positioned that isn't in the appended part of the list
+            return False
+        self._physics_key = key
+        
+        ids, index = self._physics_ids, self._node_index
+        for node_id in added:
+            index[node_id] = len(ids)
+            ids.append(node_id)
+        # Endpoints of the earlier edges were all simulated already, so only new edges can join
+        edges = [(source, target) for source, target in self.edges[old[5]:]
+                 if source in index and target in index and source != target]
+        for edge in edges:
+            self._edge_index[edge] = len(self._edge_keys)
+            self._edge_keys.append(edge)
+        
+        self._extend_array('_pos', np.array([self.node_positions[node_id] for node_id in added],
+                                            dtype=float).reshape(-1, 2))
+        self._extend_array('_vel', np.zeros((len(added), 2)))
+        self._extend_array('_radii', np.sqrt(np.array([self.node_sizes.get(node_id, 400) for node_id in added],
+                                                      dtype=float)))
+        self._extend_array('_movable', np.array([node_id != 'main' for node_id in added], dtype=bool))
+        self._extend_array('_edge_src', np.array([index[source] for source, _ in edges], dtype=np.intp))
+        self._extend_array('_edge_dst', np.array([index[target] for _, target in edges], dtype=np.intp))
+        if added:
+            self._spatial_hash_stale = True
+        return True
+    
+    def _extend_array(self, name, rows):
+        """Append rows to the physics array self.<name>, growing its buffer by doubling"""
+        if not len(rows):
+            return
+        array = getattr(self, name)
+        buffer = self._physics_buffers.get(name, array)
+        count = len(array)
+        needed = count + len(rows)
+        if len(buffer) < needed:
+            buffer = np.empty((max(needed, 2 * len(buffer)),) + array.shape[1:], dtype=array.dtype)
+            buffer[:count] = array
+            self._physics_buffers[name] = buffer
+        buffer[count:needed] = rows
+        setattr(self, name, buffer[:needed])
+    
+    def refresh_node_radius(self, node_id):
+        """Pick up a size change for a node that is already being simulated"""
+        i = self._node_index.get(node_id)
+        if i is not None:
+            self._radii[i] = math.sqrt(self.node_sizes.get(node_id, 400))
+            self._spatial_hash_stale = True
+    
+    def _sync_spatial_hash(self):
+        """Re-bucket nodes if they were added or moved since the hash was built"""
+        self._sync_physics_arrays()
+        if not self._spatial_hash_stale:
+            return
+        self._spatial_hash_stale = False
+        reach = 2 * float(self._radii.max()) if len(self._radii) else 0.0
+        self._spatial_hash.rebuild(self._pos[:, 0], self._pos[:, 1], max(64.0, reach))
+    
     def apply_collision_dynamics(self):
         """Apply collision dynamics to prevent node overlap"""
-        # Initialize velocities if needed
-        for node_id in self.nodes:
-            if node_id not in self.node_velocities:
-                self.node_velocities[node_id] = (0, 0)
-        
-        # Calculate repulsive forces between nodes
-        new_velocities = {}
-        for node_id in self.nodes:
-            if node_id not in self.node_positions:
-                continue
-                
-            vx, vy = self.node_velocities.get(node_id, (0, 0))
-            x1, y1 = self.node_positions[node_id]
-            
-            # Apply repulsion between nodes
-            for other_id in self.nodes:
-                if other_id == node_id or other_id not in self.node_positions:
-                    continue
-                    
-                x2, y2 = self.node_positions[other_id]
-                
-                # Calculate distance
-                dx = x1 - x2
-                dy = y1 - y2
-                distance = max(0.1, math.sqrt(dx*dx + dy*dy))  # Avoid division by zero
-                
-                # Get node sizes
-                size1 = math.sqrt(self.node_sizes.get(node_id, 400))
-                size2 = math.sqrt(self.node_sizes.get(other_id, 400))
-                min_distance = (size1 + size2) / 2
-                
-                # Apply repulsive force if nodes are too close
-                if distance < min_distance * 2:
-                    # Normalize direction vector
-                    nx = dx / distance
-                    ny = dy / distance
-                    
-                    # Calculate repulsion strength (stronger when closer)
-                    strength = self.repulsion_strength * (1.0 - distance / (min_distance * 2))
-                    
-                    # Apply force
-                    vx += nx * strength
-                    vy += ny * strength
-            
-            # Apply attraction along edges
-            for edge in self.edges:
-                source, target = edge
-                
-                # Skip edges that are still growing
-                if (source, target) in self.growing_edges and self.growing_edges[(source, target)] < 1.0:
-                    continue
-                
-                if source == node_id and target in self.node_positions:
-                    # This node is the source, attract towards target
-                    x2, y2 = self.node_positions[target]
-                    dx = x2 - x1
-                    dy = y2 - y1
-                    distance = max(0.1, math.sqrt(dx*dx + dy*dy))
-                    
-                    # Normalize and apply attraction
-                    vx += (dx / distance) * self.attraction_strength
-                    vy += (dy / distance) * self.attraction_strength
-                    
-                elif target == node_id and source in self.node_positions:
-                    # This node is the target, attract towards source
-                    x2, y2 = self.node_positions[source]
-                    dx = x2 - x1
-                    dy = y2 - y1
-                    distance = max(0.1, math.sqrt(dx*dx + dy*dy))
-                    
-                    # Normalize and apply attraction
-                    vx += (dx / distance) * self.attraction_strength
-                    vy += (dy / distance) * self.attraction_strength
-            
-            # Apply damping to prevent oscillation
-            vx *= self.damping
-            vy *= self.damping
-            
-            # Store new velocity
-            new_velocities[node_id] = (vx, vy)
-        
-        # Update positions based on velocities
-        for node_id, (vx, vy) in new_velocities.items():
-            if node_id in self.node_positions:
-                # Skip the main node to keep it centered
-                if node_id == 'main':
-                    continue
-                    
-                x, y = self.node_positions[node_id]
-                self.node_positions[node_id] = (x + vx, y + vy)
+        self._sync_physics_arrays()
+        pos = self._pos
+        if len(pos) < 2:
+            return
         
-        # Update velocities for next frame
-        self.node_velocities = new_velocities
+        # Fully grown edges only - growing ones don't pull yet
+        src, dst = self._edge_src, self._edge_dst
+        if self.growing_edges and len(self._edge_keys):
+            # Only the (few) growing edges are visited, not every edge
+            growing = [self._edge_index[edge] for edge, progress in self.growing_edges.items()
+                       if progress < 1.0 and edge in self._edge_index]
+            if growing:
+                grown = np.ones(len(self._edge_keys), dtype=bool)
+                grown[growing] = False
+                src, dst = src[grown], dst[grown]
+        
+        if _physics_kernel is not None:
+            all_pairs = len(pos) <= SPATIAL_HASH_MIN_NODES
+            if all_pairs:
+                first = second = np.zeros(0, dtype=np.intp)
+            else:
+                self._sync_spatial_hash()
+                first, second = self._spatial_hash.pairs()
+            _physics_kernel(pos, self._vel, self._radii, all_pairs, first, second, src, dst,
+                            self.repulsion_strength, self.attraction_strength, self.damping, self._movable)
+            self._spatial_hash_stale = True
+            self._positions_dirty = True
+            return
         
-    def paintEvent(self, event):
-        """Paint the network graph"""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if len(pos) > SPATIAL_HASH_MIN_NODES:
+            # Large graphs: only pairs in neighbouring cells can be within reach
+            self._sync_spatial_hash()
+            first, second = self._spatial_hash.pairs()
+            delta = pos[first] - pos[second]
+            distance = np.maximum(np.hypot(delta[:, 0], delta[:, 1]), 0.1)
+            reach = self._radii[first] + self._radii[second]
+            strength = self.repulsion_strength * np.clip(1.0 - distance / reach, 0.0, None)
+            velocity = self._vel.copy()
+            np.add.at(velocity, first, delta * (strength / distance)[:, None])
+        else:
+            # Pairwise repulsion: delta[i, j] points from node j to node i
+            delta = pos[:, None, :] - pos[None, :, :]
+            distance = np.maximum(np.hypot(delta[..., 0], delta[..., 1]), 0.1)  # Avoid division by zero
+            reach = self._radii[:, None] + self._radii[None, :]  # 2 * minimum distance
+            # Stronger when closer, zero beyond reach (and for each node against itself)
+            strength = self.repulsion_strength * np.clip(1.0 - distance / reach, 0.0, None)
+            np.fill_diagonal(strength, 0.0)
+            velocity = self._vel + ((delta / distance[..., None]) * strength[..., None]).sum(axis=1)
+        
+        # Attraction along edges, pulling both ends together
+        if len(src):
+            pull = pos[dst] - pos[src]
+            pull *= (self.attraction_strength / np.maximum(np.hypot(pull[:, 0], pull[:, 1]), 0.1))[:, None]
+            np.add.at(velocity, src, pull)
+            np.add.at(velocity, dst, -pull)
+        
+        # Apply damping to prevent oscillation
+        velocity *= self.damping
+        self._vel[:] = velocity  # In place - the array may be a view of a growable buffer
+        
+        # Update positions in place - painting reads the array, the dict is only refreshed on demand
+        pos[self._movable] += velocity[self._movable]
+        self._spatial_hash_stale = True
+        self._positions_dirty = True
+    
+    def layout_arrays(self):
+        """Node ids with their current positions and radii (sqrt of size), as simulated
         
-        # Get widget dimensions
+        Doesn't rebuild the physics arrays: nodes positioned since the last rebuild are
+        appended from the dicts instead.
+        """
+        index = self._node_index
+        ids, pos, radii = self._physics_ids, self._pos, self._radii
+        if self._physics_key is None or id(self.node_positions) != self._physics_key[2]:
+            index, ids = {}, []
+            pos, radii = np.zeros((0, 2)), np.zeros(0)
+        # Nodes are only ever added, so equal counts mean nothing new since the rebuild
+        added = ([node_id for node_id in self.node_positions if node_id not in index]
+                 if len(self.node_positions) != len(index) else ())
+        if added:
+            ids = ids + added
+            pos = np.concatenate((pos, np.array([self.node_positions[node_id] for node_id in added],
+                                                dtype=float).reshape(-1, 2)))
+            radii = np.concatenate((radii, np.sqrt(np.array([self.node_sizes.get(node_id, 400) for node_id in added],
+                                                            dtype=float))))
+        return ids, pos, radii
+    
+    def publish_positions(self):
+        """Copy simulated positions back into the shared node_positions dict if they moved"""
+        if not self._positions_dirty:
+            return
+        self._positions_dirty = False
+        self.node_positions.update(zip(self._physics_ids, map(tuple, self._pos.tolist()), strict=True))
+        
+    def _display_positions(self):
+        """Node positions to paint, interpolated between the last two physics steps"""
+        pos = self._pos
+        alpha = self._ticks_since_step / self.physics_every
+        if alpha >= 1.0 or self._pos_prev.shape != pos.shape:
+            return pos
+        return self._pos_prev + (pos - self._pos_prev) * alpha
+    
+    def _view_transform(self):
+        """Graph to widget coordinates: origin at the centre, 500 graph units across the shorter side"""
         width = self.width()
         height = self.height()
-        
-        # Set background with subtle gradient
-        gradient = QLinearGradient(0, 0, 0, height)
-        gradient.setColorAt(0, QColor('#1A1A1E'))  # Dark blue-gray
-        gradient.setColorAt(1, QColor('#0F0F12'))  # Darker at bottom
-        painter.fillRect(0, 0, width, height, gradient)
-        
-        # Draw subtle grid lines
-        painter.setPen(QPen(QColor(COLORS['border']).darker(150), 0.5, Qt.PenStyle.DotLine))
-        grid_size = 40
-        for x in range(0, width, grid_size):
-            painter.drawLine(x, 0, x, height)
-        for y in range(0, height, grid_size):
-            painter.drawLine(0, y, width, y)
-        
-        # Calculate center point and scale factor
-        center_x = width / 2
-        center_y = height / 2
         scale = min(width, height) / 500
+        return QTransform(scale, 0, 0, scale, width / 2, height / 2)
+    
+    def _edge_layer_stale(self, screen_positions):
+        """Whether the cached edge layer no longer matches the widget or the layout"""
+        if self._edge_layer is None or self._edge_layer_key != (self.size(), self.devicePixelRatioF(), self._physics_key):
+            return True
+        # Edges that are still growing change every frame
+        if self.growing_edges:
+            return True
+        # Redraw once any node has drifted half a pixel from where the layer drew it
+        if self._edge_layer_pos.shape != screen_positions.shape:
+            return True
+        return len(screen_positions) > 0 and float(np.abs(screen_positions - self._edge_layer_pos).max()) > 0.5
+    
+    def _render_edge_layer(self, scale, screen_positions):
+        """Draw the background, grid and static edge filaments into the cached layer"""
+        width = self.width()
+        height = self.height()
+        pixel_ratio = self.devicePixelRatioF()
+        layer = QPixmap(max(1, round(width * pixel_ratio)), max(1, round(height * pixel_ratio)))
+        layer.setDevicePixelRatio(pixel_ratio)
+        
+        painter = QPainter(layer)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        # Background gradient and grid, both rebuilt only on resize
+        painter.fillRect(0, 0, width, height, self._background)
+        painter.setPen(self._grid_pen)
+        painter.drawLines(self._grid_lines)
+        
+        # Edges that can't reach the widget are skipped
+        view_left = -self.cull_margin
+        view_top = -self.cull_margin
+        view_right = width + self.cull_margin
+        view_bottom = height + self.cull_margin
+        
+        noise = self._noise
+        flow_paths = []
+        points = screen_positions.tolist()
+        index = self._node_index
         
-        # Draw edges first so they appear behind nodes
         for edge in self.edges:
             source, target = edge
-            if source in self.node_positions and target in self.node_positions:
-                src_x, src_y = self.node_positions[source]
-                dst_x, dst_y = self.node_positions[target]
+            if source in index and target in index:
+                screen_src_x, screen_src_y = points[index[source]]
+                screen_dst_x, screen_dst_y = points[index[target]]
                 
-                # Transform coordinates to screen space
-                screen_src_x = center_x + src_x * scale
-                screen_src_y = center_y + src_y * scale
-                screen_dst_x = center_x + dst_x * scale
-                screen_dst_y = center_y + dst_y * scale
+                # Skip edges whose bounding box lies entirely outside the viewport
+                if (max(screen_src_x, screen_dst_x) < view_left or min(screen_src_x, screen_dst_x) > view_right or
+                        max(screen_src_y, screen_dst_y) < view_top or min(screen_src_y, screen_dst_y) > view_bottom):
+                    continue
                 
                 # Get growth progress for this edge (default to 1.0 if not growing)
                 growth_progress = self.growing_edges.get((source, target), 1.0)
@@ -314,49 +1159,40 @@ class NetworkGraphWidget(QWidget):
                     actual_dst_y = screen_dst_y
                 
                 # Draw mycelial connection (multiple thin lines with variations)
-                source_color = QColor(self.node_colors.get(source, self.node_colors_by_type['main']))
-                target_color = QColor(self.node_colors.get(target, self.node_colors_by_type['main']))
+                source_color = self.node_colors.get(source, self.node_colors_by_type['main'])
+                target_color = self.node_colors.get(target, self.node_colors_by_type['main'])
                 
                 # Number of filaments per connection
                 num_filaments = 3
+                k = self._noise_offset(edge)
+                
+                # Edge vector and the unit vector perpendicular to it, constant along the edge
+                span_x = actual_dst_x - screen_src_x
+                span_y = actual_dst_y - screen_src_y
+                angle = math.atan2(span_y, span_x) + math.pi / 2
+                perpendicular_x = math.cos(angle)
+                perpendicular_y = math.sin(angle)
+                
+                # Number of segments increases with distance
+                distance = math.hypot(span_x, span_y)
+                num_segments = max(3, int(distance / 40))
                 
                 for i in range(num_filaments):
                     # Create a path with multiple segments for organic look
                     path = QPainterPath()
                     path.moveTo(screen_src_x, screen_src_y)
                     
-                    # Calculate distance between points
-                    distance = math.sqrt((actual_dst_x - screen_src_x)**2 + (actual_dst_y - screen_src_y)**2)
-                    
-                    # Number of segments increases with distance
-                    num_segments = max(3, int(distance / 40))
-                    
-                    # Create intermediate points with slight random variations
-                    prev_x, prev_y = screen_src_x, screen_src_y
-                    
+                    # Intermediate points with slight random variations perpendicular to the line
                     for j in range(1, num_segments):
-                        # Calculate position along the line
                         ratio = j / num_segments
-                        
-                        # Base position
-                        base_x = screen_src_x + (actual_dst_x - screen_src_x) * ratio
-                        base_y = screen_src_y + (actual_dst_y - screen_src_y) * ratio
-                        
-                        # Add random variation perpendicular to the line
-                        angle = math.atan2(actual_dst_y - screen_src_y, actual_dst_x - screen_src_x) + math.pi/2
-                        variation = (random.random() - 0.5) * 10 * scale
+                        variation = (noise[k & NOISE_MASK] - 0.5) * 10 * scale
+                        k += 1
                         
                         # Variation decreases near endpoints
-                        endpoint_factor = min(ratio, 1 - ratio) * 4  # Maximum at middle
-                        variation *= endpoint_factor
-                        
-                        # Apply variation
-                        point_x = base_x + variation * math.cos(angle)
-                        point_y = base_y + variation * math.sin(angle)
+                        variation *= min(ratio, 1 - ratio) * 4  # Maximum at middle
                         
-                        # Add point to path
-                        path.lineTo(point_x, point_y)
-                        prev_x, prev_y = point_x, point_y
+                        path.lineTo(screen_src_x + span_x * ratio + variation * perpendicular_x,
+                                    screen_src_y + span_y * ratio + variation * perpendicular_y)
                     
                     # Complete the path to destination
                     path.lineTo(actual_dst_x, actual_dst_y)
@@ -364,29 +1200,18 @@ class NetworkGraphWidget(QWidget):
                     # Create gradient along the path
                     gradient = QLinearGradient(screen_src_x, screen_src_y, actual_dst_x, actual_dst_y)
                     
-                    # Make colors more transparent for mycelial effect
-                    source_color_trans = QColor(source_color)
-                    target_color_trans = QColor(target_color)
-                    
-                    # Vary transparency by filament
+                    # Make colors more transparent for mycelial effect, varying by filament
                     alpha = 70 + i * 20
-                    source_color_trans.setAlpha(alpha)
-                    target_color_trans.setAlpha(alpha)
-                    
-                    gradient.setColorAt(0, source_color_trans)
-                    gradient.setColorAt(1, target_color_trans)
-                    
-                    # Animate flow along edge
-                    flow_pos = (self.animation_progress + i * 0.3) % 1.0
-                    flow_color = QColor(255, 255, 255, 100)
-                    gradient.setColorAt(flow_pos, flow_color)
+                    gradient.setColorAt(0, self._color(source_color, alpha))
+                    gradient.setColorAt(1, self._color(target_color, alpha))
                     
                     # Draw the edge with varying thickness
-                    thickness = 1.0 + (i * 0.5)
-                    pen = QPen(QBrush(gradient), thickness)
-                    pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+                    pen = self._stroke_pen
+                    pen.setBrush(QBrush(gradient))
+                    pen.setWidthF(1.0 + (i * 0.5))
                     painter.setPen(pen)
                     painter.drawPath(path)
+                    flow_paths.append((path, i * 0.3))
                 
                 # Draw small nodes along the path for mycelial effect
                 if growth_progress == 1.0:  # Only for fully grown edges
@@ -397,165 +1222,206 @@ class NetworkGraphWidget(QWidget):
                         node_y = screen_src_y + (screen_dst_y - screen_src_y) * ratio
                         
                         # Add small random offset
-                        offset_angle = random.random() * math.pi * 2
-                        offset_dist = random.random() * 5
+                        offset_angle = noise[k & NOISE_MASK] * math.pi * 2
+                        offset_dist = noise[(k + 1) & NOISE_MASK] * 5
                         node_x += math.cos(offset_angle) * offset_dist
                         node_y += math.sin(offset_angle) * offset_dist
                         
                         # Draw small node
-                        node_color = QColor(source_color)
-                        node_color.setAlpha(100)
                         painter.setPen(Qt.PenStyle.NoPen)
-                        painter.setBrush(QBrush(node_color))
-                        node_size = 1 + random.random() * 2
+                        painter.setBrush(self._color(source_color, 100))
+                        node_size = 1 + noise[(k + 2) & NOISE_MASK] * 2
+                        k += 3
                         painter.drawEllipse(QPointF(node_x, node_y), node_size, node_size)
         
+        painter.end()
+        
+        self._edge_layer = layer
+        self._edge_layer_key = (self.size(), pixel_ratio, self._physics_key)
+        self._edge_layer_pos = screen_positions
+        self._flow_paths = flow_paths
+    
+    def paintEvent(self, event):
+        """Paint the network graph"""
+        # Map every node to screen space in one go rather than per coordinate in the loops below
+        transform = self._view_transform()
+        scale = transform.m11()
+        self._sync_physics_arrays()
+        screen_positions = self._display_positions() * scale
+        screen_positions += (transform.dx(), transform.dy())
+        if self._edge_layer_stale(screen_positions):
+            self._render_edge_layer(scale, screen_positions)
+        
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        # Background, grid and edge filaments come from the cached layer
+        # (the painter is clipped to the update region, so partial repaints blit only that part)
+        painter.drawPixmap(0, 0, self._edge_layer)
+        
+        # Animated flow along the edges, drawn fresh each frame on top of the layer
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self._flow_brush)
+        glow = self.flow_glow_radius
+        for path, phase in self._flow_paths:
+            point = path.pointAtPercent((self.animation_progress + phase) % 1.0)
+            painter.setBrushOrigin(point)
+            painter.drawEllipse(point, glow, glow)
+        painter.setBrushOrigin(0, 0)
+        
+        # Only paint what intersects the area being repainted - nodes drifted off-screen
+        # (or outside a partial update) cost nothing
+        dirty = event.rect()
+        view_left = dirty.left() - self.cull_margin
+        view_top = dirty.top() - self.cull_margin
+        view_right = dirty.right() + 1 + self.cull_margin
+        view_bottom = dirty.bottom() + 1 + self.cull_margin
+        
         # Draw nodes
-        for node_id in self.nodes:
-            if node_id in self.node_positions:
-                x, y = self.node_positions[node_id]
-                
-                # Transform coordinates to screen space
-                screen_x = center_x + x * scale
-                screen_y = center_y + y * scale
-                
-                # Get node properties
-                node_color = self.node_colors.get(node_id, self.node_colors_by_type['branch'])
-                node_label = self.node_labels.get(node_id, 'Node')
-                node_size = self.node_sizes.get(node_id, 400)
-                
-                # Scale the node size
-                radius = math.sqrt(node_size) * scale / 2
-                
-                # Adjust radius for hover/selection
-                if node_id == self.selected_node:
-                    radius *= 1.1  # Larger when selected
-                elif node_id == self.hovered_node:
-                    radius *= 1.05  # Slightly larger when hovered
-                
-                # Draw node glow for selected/hovered nodes
-                if node_id == self.selected_node or node_id == self.hovered_node:
-                    glow_radius = radius * 1.5
-                    glow_color = QColor(node_color)
-                    
-                    for i in range(5):
-                        r = glow_radius - (i * radius * 0.1)
-                        alpha = 40 - (i * 8)
-                        glow_color.setAlpha(alpha)
-                        painter.setPen(Qt.PenStyle.NoPen)
-                        painter.setBrush(glow_color)
-                        painter.drawEllipse(QPointF(screen_x, screen_y), r, r)
-                
-                # Draw mycelial node (irregular shape with hyphae)
-                painter.setPen(Qt.PenStyle.NoPen)
-                
-                # Create gradient fill for node
-                gradient = QRadialGradient(screen_x, screen_y, radius)
-                base_color = QColor(node_color)
-                lighter_color = QColor(node_color).lighter(130)
-                darker_color = QColor(node_color).darker(130)
-                
-                gradient.setColorAt(0, lighter_color)
-                gradient.setColorAt(0.7, base_color)
-                gradient.setColorAt(1, darker_color)
-                
-                # Fill main node body
-                painter.setBrush(QBrush(gradient))
-                
-                # Draw irregular node shape
-                path = QPainterPath()
-                
-                # Create irregular circle with random variations
-                num_points = 20
-                start_angle = random.random() * math.pi * 2
+        for node_id, (screen_x, screen_y), base_radius in zip(self._physics_ids, screen_positions.tolist(),
+                                                              self._radii.tolist(), strict=True):
+            # Get node properties
+            node_color = self.node_colors.get(node_id, self.node_colors_by_type['branch'])
+            node_label = self.node_labels.get(node_id, 'Node')
+            
+            # Scale the node size (sqrt of the size, cached with the physics arrays)
+            radius = base_radius * scale / 2
+            
+            # Skip nodes (including glow and hyphae) that cannot reach the viewport
+            extent = radius * 2
+            if (screen_x + extent < view_left or screen_x - extent > view_right or
+                    screen_y + extent < view_top or screen_y - extent > view_bottom):
+                continue
+            
+            # Adjust radius for hover/selection
+            if node_id == self.selected_node:
+                radius *= 1.1  # Larger when selected
+            elif node_id == self.hovered_node:
+                radius *= 1.05  # Slightly larger when hovered
+            
+            # Draw node glow for selected/hovered nodes
+            if node_id == self.selected_node or node_id == self.hovered_node:
+                glow_radius = radius * 1.5
                 
-                for i in range(num_points + 1):
-                    angle = start_angle + (i * 2 * math.pi / num_points)
-                    # Vary radius slightly for organic look
-                    variation = 1.0 + (random.random() - 0.5) * 0.2
-                    point_radius = radius * variation
-                    
-                    x_point = screen_x + math.cos(angle) * point_radius
-                    y_point = screen_y + math.sin(angle) * point_radius
-                    
-                    if i == 0:
-                        path.moveTo(x_point, y_point)
-                    else:
-                        # Use quadratic curves for smoother shape
-                        control_angle = start_angle + ((i - 0.5) * 2 * math.pi / num_points)
-                        control_radius = radius * (1.0 + (random.random() - 0.5) * 0.1)
-                        control_x = screen_x + math.cos(control_angle) * control_radius
-                        control_y = screen_y + math.sin(control_angle) * control_radius
-                        
-                        path.quadTo(control_x, control_y, x_point, y_point)
+                for i in range(5):
+                    r = glow_radius - (i * radius * 0.1)
+                    alpha = 40 - (i * 8)
+                    painter.setPen(Qt.PenStyle.NoPen)
+                    painter.setBrush(self._color(node_color, alpha))
+                    painter.drawEllipse(QPointF(screen_x, screen_y), r, r)
+            
+            # Draw mycelial node (irregular shape with hyphae)
+            painter.setPen(Qt.PenStyle.NoPen)
+            
+            # Create gradient fill for node
+            gradient = QRadialGradient(screen_x, screen_y, radius)
+            lighter_color, base_color, darker_color = self._shades(node_color)
+            
+            gradient.setColorAt(0, lighter_color)
+            gradient.setColorAt(0.7, base_color)
+            gradient.setColorAt(1, darker_color)
+            
+            # Fill main node body
+            painter.setBrush(QBrush(gradient))
+            
+            # Cached unit-radius shape, placed and sized with one affine map
+            body_path, hyphae = self._node_shape(node_id)
+            transform = QTransform(radius, 0, 0, radius, screen_x, screen_y)
+            
+            # Draw the main node body
+            painter.drawPath(transform.map(body_path))
+            
+            # Draw hyphae (mycelial extensions)
+            # Hypha color starts as node color and fades out
+            hypha_start_color = self._color(node_color, 150)
+            hypha_end_color = self._color(node_color, 30)
+            small_node_color = self._color(node_color, 100)
+            
+            for hypha_path, start_point, end_point, thickness, small_node_size in hyphae:
+                start = transform.map(start_point)
+                end = transform.map(end_point)
                 
-                # Draw the main node body
-                painter.drawPath(path)
+                # Draw hypha with gradient
+                hypha_gradient = QLinearGradient(start, end)
+                hypha_gradient.setColorAt(0, hypha_start_color)
+                hypha_gradient.setColorAt(1, hypha_end_color)
                 
-                # Draw hyphae (mycelial extensions)
-                hyphae_count = self.hyphae_count
-                if node_id == 'main':
-                    hyphae_count += 3  # More hyphae for main node
+                # Draw hypha with varying thickness
+                hypha_pen = self._stroke_pen
+                hypha_pen.setBrush(QBrush(hypha_gradient))
+                hypha_pen.setWidthF(thickness)
+                painter.setPen(hypha_pen)
+                painter.drawPath(transform.map(hypha_path))
                 
-                for i in range(hyphae_count):
-                    # Random angle for hyphae
-                    angle = random.random() * math.pi * 2
-                    
-                    # Base length varies by node type
-                    base_length = radius * self.hyphae_length_factor
-                    if node_id == 'main':
-                        base_length *= 1.5
-                    
-                    # Random variation in length
-                    length = base_length * (1.0 + (random.random() - 0.5) * self.hyphae_variation)
-                    
-                    # Calculate end point
-                    end_x = screen_x + math.cos(angle) * (radius + length)
-                    end_y = screen_y + math.sin(angle) * (radius + length)
-                    
-                    # Start point is on the node perimeter
-                    start_x = screen_x + math.cos(angle) * radius * 0.9
-                    start_y = screen_y + math.sin(angle) * radius * 0.9
-                    
-                    # Create hyphae path with slight curve
-                    hypha_path = QPainterPath()
-                    hypha_path.moveTo(start_x, start_y)
-                    
-                    # Control point for curve
-                    ctrl_angle = angle + (random.random() - 0.5) * 0.5  # Slight angle variation
-                    ctrl_dist = radius + length * 0.5
-                    ctrl_x = screen_x + math.cos(ctrl_angle) * ctrl_dist
-                    ctrl_y = screen_y + math.sin(ctrl_angle) * ctrl_dist
-                    
-                    hypha_path.quadTo(ctrl_x, ctrl_y, end_x, end_y)
-                    
-                    # Draw hypha with gradient
-                    hypha_gradient = QLinearGradient(start_x, start_y, end_x, end_y)
-                    
-                    # Hypha color starts as node color and fades out
-                    hypha_start_color = QColor(node_color)
-                    hypha_end_color = QColor(node_color)
-                    hypha_start_color.setAlpha(150)
-                    hypha_end_color.setAlpha(30)
-                    
-                    hypha_gradient.setColorAt(0, hypha_start_color)
-                    hypha_gradient.setColorAt(1, hypha_end_color)
-                    
-                    # Draw hypha with varying thickness
-                    thickness = 1.0 + random.random() * 1.5
-                    hypha_pen = QPen(QBrush(hypha_gradient), thickness)
-                    hypha_pen.setCapStyle(Qt.PenCapStyle.RoundCap)
-                    painter.setPen(hypha_pen)
-                    painter.drawPath(hypha_path)
-                    
-                    # Add small nodes at the end of some hyphae
-                    if random.random() > 0.5:
-                        small_node_color = QColor(node_color)
-                        small_node_color.setAlpha(100)
-                        painter.setPen(Qt.PenStyle.NoPen)
-                        painter.setBrush(QBrush(small_node_color))
-                        small_node_size = 1 + random.random() * 2
-                        painter.drawEllipse(QPointF(end_x, end_y), small_node_size, small_node_size)
+                # Add small nodes at the end of some hyphae
+                if small_node_size:
+                    painter.setPen(Qt.PenStyle.NoPen)
+                    painter.setBrush(small_node_color)
+                    painter.drawEllipse(end, small_node_size, small_node_size)
+    
+    def _node_shape(self, node_id):
+        """Irregular body and hyphae of a node, built once in unit-radius coordinates around (0, 0)"""
+        shape = self._node_shapes.get(node_id)
+        if shape is not None:
+            return shape
+        
+        noise = self._noise
+        k = self._noise_offset(node_id)
+        
+        # Irregular circle with random variations
+        path = QPainterPath()
+        num_points = 20
+        start_angle = noise[k & NOISE_MASK] * math.pi * 2
+        k += 1
+        
+        for i in range(num_points + 1):
+            angle = start_angle + (i * 2 * math.pi / num_points)
+            # Vary radius slightly for organic look
+            point_radius = 1.0 + (noise[k & NOISE_MASK] - 0.5) * 0.2
+            k += 1
+            x_point = math.cos(angle) * point_radius
+            y_point = math.sin(angle) * point_radius
+            
+            if i == 0:
+                path.moveTo(x_point, y_point)
+            else:
+                # Use quadratic curves for smoother shape
+                control_angle = start_angle + ((i - 0.5) * 2 * math.pi / num_points)
+                control_radius = 1.0 + (noise[k & NOISE_MASK] - 0.5) * 0.1
+                k += 1
+                path.quadTo(math.cos(control_angle) * control_radius, math.sin(control_angle) * control_radius,
+                            x_point, y_point)
+        
+        # Hyphae: (path, start, end, pen thickness, end node size or 0)
+        hyphae = []
+        hyphae_count = self.hyphae_count
+        base_length = self.hyphae_length_factor
+        if node_id == 'main':
+            hyphae_count += 3  # More hyphae for main node
+            base_length *= 1.5
+        
+        for _ in range(hyphae_count):
+            angle = noise[k & NOISE_MASK] * math.pi * 2
+            length = base_length * (1.0 + (noise[(k + 1) & NOISE_MASK] - 0.5) * self.hyphae_variation)
+            
+            # From just inside the perimeter out past it, with a slight curve
+            start_point = QPointF(math.cos(angle) * 0.9, math.sin(angle) * 0.9)
+            end_point = QPointF(math.cos(angle) * (1.0 + length), math.sin(angle) * (1.0 + length))
+            ctrl_angle = angle + (noise[(k + 2) & NOISE_MASK] - 0.5) * 0.5  # Slight angle variation
+            ctrl_dist = 1.0 + length * 0.5
+            
+            hypha_path = QPainterPath(start_point)
+            hypha_path.quadTo(math.cos(ctrl_angle) * ctrl_dist, math.sin(ctrl_angle) * ctrl_dist,
+                              end_point.x(), end_point.y())
+            
+            thickness = 1.0 + noise[(k + 3) & NOISE_MASK] * 1.5
+            # Small nodes at the end of some hyphae
+            small_node_size = 1 + noise[(k + 5) & NOISE_MASK] * 2 if noise[(k + 4) & NOISE_MASK] > 0.5 else 0
+            hyphae.append((hypha_path, start_point, end_point, thickness, small_node_size))
+            k += 6
+        
+        shape = self._node_shapes[node_id] = (path, hyphae)
+        return shape
     
     def draw_arrow_head(self, painter, x1, y1, x2, y2):
         """Draw an arrow head at the end of a line"""
@@ -571,8 +1437,10 @@ class NetworkGraphWidget(QWidget):
             # Check if a node was clicked
             clicked_node = self.get_node_at_position(pos)
             if clicked_node:
-                self.selected_node = clicked_node
-                self.update()
+                if clicked_node != self.selected_node:
+                    previous = self.selected_node
+                    self.selected_node = clicked_node
+                    self.update_nodes(previous, clicked_node)
                 self.nodeSelected.emit(clicked_node)
     
     def mouseMoveEvent(self, event):
@@ -581,66 +1449,64 @@ class NetworkGraphWidget(QWidget):
         hovered_node = self.get_node_at_position(pos)
         
         if hovered_node != self.hovered_node:
+            previous = self.hovered_node
             self.hovered_node = hovered_node
-            self.update()
+            self.update_nodes(previous, hovered_node)
             if hovered_node:
                 self.nodeHovered.emit(hovered_node)
                 
                 # Show tooltip with node info
                 if hovered_node in self.node_labels:
-                    # Get node type from the ID
-                    node_type = "main"
-                    if "rabbithole_" in hovered_node:
-                        node_type = "rabbithole"
-                    elif "fork_" in hovered_node:
-                        node_type = "fork"
-                    
-                    # Set emoji based on node type
-                    emoji = "🌱"  # Default/main
-                    if node_type == "rabbithole":
-                        emoji = "🕳️"  # Rabbithole emoji
-                    elif node_type == "fork":
-                        emoji = "🔱"  # Fork emoji
+                    # Emoji from the type recorded when the node was added
+                    emoji = self.node_emoji_by_type.get(self.node_types.get(hovered_node), "🌱")
                     
-                    # Show tooltip with emoji and label
-                    QToolTip.showText(
-                        event.globalPosition().toPoint(),
-                        f"{emoji} {self.node_labels[hovered_node]}",
-                        self
-                    )
+                    # Show tooltip with emoji and label once the pointer settles
+                    self._tooltip_pos = event.globalPosition().toPoint()
+                    self._tooltip_text = f"{emoji} {self.node_labels[hovered_node]}"
+                    self._tooltip_timer.start()
+            else:
+                self._tooltip_timer.stop()
+                QToolTip.hideText()
+    
+    def leaveEvent(self, event):
+        """Drop hover state when the pointer leaves the graph"""
+        self._tooltip_timer.stop()
+        if self.hovered_node:
+            previous = self.hovered_node
+            self.hovered_node = None
+            QToolTip.hideText()
+            self.update_nodes(previous)
+        super().leaveEvent(event)
+    
+    def show_hover_tooltip(self):
+        """Show the pending node tooltip (fired by the debounce timer)"""
+        if self.hovered_node:
+            QToolTip.showText(self._tooltip_pos, self._tooltip_text, self)
     
     def get_node_at_position(self, pos):
         """Get the node at the given position"""
-        # Calculate center point and scale factor
-        width = self.width()
-        height = self.height()
-        center_x = width / 2
-        center_y = height / 2
-        scale = min(width, height) / 500
-                    
-        # Check each node
-        for node_id in self.nodes:
-            if node_id in self.node_positions:
-                    x, y = self.node_positions[node_id]
-                    screen_x = center_x + x * scale
-                    screen_y = center_y + y * scale
-                    
-                    # Get node size
-                    node_size = self.node_sizes.get(node_id, 400)
-                    radius = math.sqrt(node_size) * scale / 2
-                    
-            # Check if click is inside the node
-                    distance = math.sqrt((pos.x() - screen_x)**2 + (pos.y() - screen_y)**2)
-                    if distance <= radius:
-                        return node_id
+        # Work in graph coordinates: map the pointer back through the view transform
+        transform, invertible = self._view_transform().inverted()
+        if not invertible:
+            return None
+        point = transform.map(pos)
+        x, y = point.x(), point.y()
+        
+        # Only nodes bucketed near the pointer can contain it
+        self._sync_spatial_hash()
+        ids = self._physics_ids
+        positions = self._pos
+        hit = None
+        for i in self._spatial_hash.near(x, y).tolist():
+            # Overlapping nodes resolve to the earliest one, as drawn first
+            if hit is not None and i > hit:
+                continue
+            # Check if the point is inside the node
+            if math.hypot(x - positions[i, 0], y - positions[i, 1]) <= self._radii[i] / 2:
+                hit = i
         
-        return None
+        return ids[hit] if hit is not None else None
     
-    def resizeEvent(self, event):
-        """Handle resize events"""
-        super().resizeEvent(event)
-        self.update()
-
 class NetworkPane(QWidget):
     nodeSelected = pyqtSignal(str)
     
@@ -666,10 +1532,17 @@ class NetworkPane(QWidget):
     
         # Initialize graph
         self.graph = nx.DiGraph()
+        # Python-side mirrors of the graph's node/edge lists, kept in lockstep with
+        # the graph so update_graph() doesn't rebuild them from networkx each call
+        self._node_list = []
+        self._edge_list = []
         self.node_positions = {}
         self.node_colors = {}
         self.node_labels = {}
         self.node_sizes = {}
+        self.node_types = {}
+        # Placement jitter source (PCG64) - batches draw all their offsets in one call
+        self._rng = np.random.default_rng()
         
         # Add main node
         self.add_node('main', 'Seed', 'main')
@@ -677,51 +1550,94 @@ class NetworkPane(QWidget):
     def add_node(self, node_id, label, node_type='branch'):
         """Add a node to the graph"""
         try:
-            # Add the node to the graph
-            self.graph.add_node(node_id)
-            
-            # Set node properties based on type
-            if node_type == 'main':
-                color = '#569CD6'  # Blue
-                size = 800
-            elif node_type == 'rabbithole':
-                color = '#B5CEA8'  # Green
-                size = 600
-            elif node_type == 'fork':
-                color = '#DCDCAA'  # Yellow
-                size = 600
-            else:
-                color = '#CE9178'  # Orange
-                size = 400
+            self._insert_node(node_id, label, node_type)
             
-            # Store node properties
-            self.node_colors[node_id] = color
-            self.node_labels[node_id] = label
-            self.node_sizes[node_id] = size
+            # Redraw the graph around the new node
+            self.update_graph((node_id,))
             
-            # Calculate position based on existing nodes
-            self.calculate_node_position(node_id, node_type)
+        except Exception as e:
+            print(f"Error adding node: {e}")
+    
+    def add_branch_node(self, node_id, label, node_type, parent_id):
+        """Add a branch node and its edge from the parent, redrawing once"""
+        try:
+            self._insert_node(node_id, label, node_type)
+            self._insert_edge(parent_id, node_id)
             
-            # Redraw the graph
-            self.update_graph()
+            # Single redraw for the node + edge pair
+            self.update_graph((parent_id, node_id))
             
         except Exception as e:
-            print(f"Error adding node: {e}")
+            print(f"Error adding branch node: {e}")
+    
+    def add_nodes(self, nodes, edges=()):
+        """Add many nodes (node_id, label, node_type) and edges (source_id, target_id), redrawing once
+        
+        Nodes are placed in order, exactly as successive add_node() calls would place them.
+        """
+        try:
+            nodes = list(nodes)
+            # Jitter for every placed (non-main) node at once; same stream as drawing it per node
+            jitter = iter(self._rng.uniform(-30, 30, size=(sum(node_type != 'main' for _, _, node_type in nodes), 2)))
+            changed = []
+            for node_id, label, node_type in nodes:
+                self._insert_node(node_id, label, node_type, None if node_type == 'main' else next(jitter))
+                changed.append(node_id)
+            for source_id, target_id in edges:
+                self._insert_edge(source_id, target_id)
+                changed += (source_id, target_id)
+            
+            # Single redraw for the whole batch
+            self.update_graph(changed)
+            
+        except Exception as e:
+            print(f"Error adding nodes: {e}")
+    
+    def _insert_node(self, node_id, label, node_type, jitter=None):
+        """Add a node and its display properties without redrawing"""
+        # Add the node to the graph
+        if node_id not in self.graph:
+            self._node_list.append(node_id)
+        self.graph.add_node(node_id)
+            
+        # Store node properties based on type
+        props = NODE_TYPE_PROPS.get(node_type, NODE_TYPE_PROPS['branch'])
+        self.node_colors[node_id] = props['color']
+        self.node_labels[node_id] = label
+        self.node_sizes[node_id] = props['size']
+        self.node_types[node_id] = node_type
+        if hasattr(self, 'network_view'):
+            self.network_view.refresh_node_radius(node_id)
+        
+        # Calculate position based on existing nodes
+        self.calculate_node_position(node_id, node_type, jitter)
     
     def add_edge(self, source_id, target_id):
         """Add an edge between two nodes"""
         try:
             # Add the edge to the graph
-            self.graph.add_edge(source_id, target_id)
+            self._insert_edge(source_id, target_id)
             
-            # Redraw the graph
-            self.update_graph()
+            # Redraw the graph around the edge
+            self.update_graph((source_id, target_id))
             
         except Exception as e:
             print(f"Error adding edge: {e}")
     
-    def calculate_node_position(self, node_id, node_type):
-        """Calculate position for a new node"""
+    def _insert_edge(self, source_id, target_id):
+        """Add an edge to the graph and the mirrored lists without redrawing"""
+        for node_id in (source_id, target_id):
+            if node_id not in self.graph:
+                self._node_list.append(node_id)
+        if not self.graph.has_edge(source_id, target_id):
+            self._edge_list.append((source_id, target_id))
+        self.graph.add_edge(source_id, target_id)
+    
+    def calculate_node_position(self, node_id, node_type, jitter=None):
+        """Calculate position for a new node
+        
+        jitter is the (dx, dy) random offset to apply; drawn here if not given.
+        """
         # Get number of existing nodes
         num_nodes = len(self.graph.nodes) - 1  # Exclude the main node
         
@@ -739,77 +1655,83 @@ class NetworkPane(QWidget):
             base_distance = 200
             count_factor = min(1.0, num_nodes / 20)  # Scale up to 20 nodes
             
-            if node_type == 'rabbithole':
-                distance = base_distance * (1.0 + count_factor * 0.5)
-            elif node_type == 'fork':
-                distance = base_distance * (1.2 + count_factor * 0.5)
-            else:
-                distance = base_distance * (1.4 + count_factor * 0.5)
+            props = NODE_TYPE_PROPS.get(node_type, NODE_TYPE_PROPS['branch'])
+            distance = base_distance * (props['distance'] + count_factor * 0.5)
             
             # Calculate position using polar coordinates
             x = distance * math.cos(angle)
             y = distance * math.sin(angle)
             
             # Add some random offset for natural appearance
-            x += random.uniform(-30, 30)
-            y += random.uniform(-30, 30)
+            if jitter is None:
+                jitter = self._rng.uniform(-30, 30, size=2)
+            x += float(jitter[0])
+            y += float(jitter[1])
             
-            # Check for potential overlaps with existing nodes and adjust if needed
-            overlap = True
+            # Check for potential overlaps with existing nodes and adjust if needed, testing
+            # against every node at once using the simulation's own position/radius arrays
             max_attempts = 5
-            attempt = 0
-            
-            while overlap and attempt < max_attempts:
-                overlap = False
-                for existing_id, (ex, ey) in self.node_positions.items():
-                    # Skip comparing with self
-                    if existing_id == node_id:
-                        continue
-                        
-                    # Calculate distance between nodes
-                    dx = x - ex
-                    dy = y - ey
-                    distance = math.sqrt(dx*dx + dy*dy)
-                    
-                    # Get node sizes
-                    new_size = math.sqrt(self.node_sizes.get(node_id, 400))
-                    existing_size = math.sqrt(self.node_sizes.get(existing_id, 400))
-                    min_distance = (new_size + existing_size) / 2
-                    
-                    # If too close, adjust position
-                    if distance < min_distance * 1.5:
-                        overlap = True
-                        # Move away from the overlapping node
-                        angle = math.atan2(dy, dx)
-                        adjustment = min_distance * 1.5 - distance
-                        x += math.cos(angle) * adjustment * 1.2
-                        y += math.sin(angle) * adjustment * 1.2
-                        break
+            ids, positions, existing_sizes = self.network_view.layout_arrays()
+            if node_id in ids:
+                others = np.array([existing_id != node_id for existing_id in ids], dtype=bool)
+                positions, existing_sizes = positions[others], existing_sizes[others]
+            if len(positions):
+                new_size = math.sqrt(self.node_sizes.get(node_id, 400))
+                # Closest allowed distance to each node: 1.5x the mean of the two radii
+                clearance = (new_size + existing_sizes) / 2 * 1.5
+                clearance_squared = clearance * clearance
                 
-                attempt += 1
+                for _ in range(max_attempts):
+                    dx = x - positions[:, 0]
+                    dy = y - positions[:, 1]
+                    # Squared distances for the test - only the node being moved away from needs a sqrt
+                    too_close = np.flatnonzero(dx * dx + dy * dy < clearance_squared)
+                    if not len(too_close):
+                        break
+                    
+                    # Move away from the first overlapping node, along the unit vector between them
+                    k = too_close[0]
+                    distance = math.sqrt(float(dx[k] * dx[k] + dy[k] * dy[k]))
+                    adjustment = (float(clearance[k]) - distance) * 1.2
+                    if distance > 0:
+                        scale = adjustment / distance
+                        x += float(dx[k]) * scale
+                        y += float(dy[k]) * scale
+                    else:
+                        # Exactly on top of it - push along +x, as atan2(0, 0) did
+                        x += adjustment
             
             # Store the position
             self.node_positions[node_id] = (x, y)
     
-    def update_graph(self):
-        """Update the network graph visualization"""
+    def update_graph(self, changed_nodes=None):
+        """Update the network graph visualization
+        
+        If changed_nodes is given, only the area around those nodes (and so the edges
+        between them) is repainted; otherwise the whole view.
+        """
         if hasattr(self, 'network_view'):
             # Update the network view with current graph data
-            self.network_view.nodes = list(self.graph.nodes())
-            self.network_view.edges = list(self.graph.edges())
+            self.network_view.nodes = self._node_list
+            self.network_view.edges = self._edge_list
             self.network_view.node_positions = self.node_positions
             self.network_view.node_colors = self.node_colors
             self.network_view.node_labels = self.node_labels
             self.network_view.node_sizes = self.node_sizes
+            self.network_view.node_types = self.node_types
             
-            # Redraw
-            self.network_view.update()
+            # Redraw, and let new nodes settle at the full frame rate - coalesced, so a burst
+            # of additions in one event-loop turn costs one wake-up and one repaint
+            self.network_view.schedule_update(changed_nodes or None)
 
 class ControlPanel(QWidget):
     """Control panel with mode, model selections, etc."""
     def __init__(self):
         super().__init__()
         
+        # File checks in flight on the thread pool (holding them keeps their signals alive)
+        self._stat_tasks = set()
+        
         # Set up the UI
         self.setup_ui()
         
@@ -849,12 +1771,11 @@ class ControlPanel(QWidget):
         mode_layout.setSpacing(5)
         
         mode_label = QLabel("Conversation Mode")
-        mode_label.setStyleSheet(f"color: {COLORS['text_dim']}; font-size: 12px;")
+        mode_label.setObjectName("fieldLabel")
         mode_layout.addWidget(mode_label)
         
         self.mode_selector = QComboBox()
         self.mode_selector.addItems(["AI-AI", "Human-AI"])
-        self.mode_selector.setStyleSheet(self.get_combobox_style())
         mode_layout.addWidget(self.mode_selector)
         
         left_column.addWidget(mode_container)
@@ -866,12 +1787,11 @@ class ControlPanel(QWidget):
         iterations_layout.setSpacing(5)
         
         iterations_label = QLabel("Iterations")
-        iterations_label.setStyleSheet(f"color: {COLORS['text_dim']}; font-size: 12px;")
+        iterations_label.setObjectName("fieldLabel")
         iterations_layout.addWidget(iterations_label)
         
         self.iterations_selector = QComboBox()
         self.iterations_selector.addItems(["1", "2", "4", "6", "12", "100"])
-        self.iterations_selector.setStyleSheet(self.get_combobox_style())
         iterations_layout.addWidget(self.iterations_selector)
         
         left_column.addWidget(iterations_container)
@@ -887,11 +1807,10 @@ class ControlPanel(QWidget):
         ai1_layout.setSpacing(5)
         
         ai1_label = QLabel("AI-1 Model")
-        ai1_label.setStyleSheet(f"color: {COLORS['text_dim']}; font-size: 12px;")
+        ai1_label.setObjectName("fieldLabel")
         ai1_layout.addWidget(ai1_label)
         
         self.ai1_model_selector = QComboBox()
-        self.ai1_model_selector.setStyleSheet(self.get_combobox_style())
         ai1_layout.addWidget(self.ai1_model_selector)
         
         middle_column.addWidget(ai1_container)
@@ -903,11 +1822,10 @@ class ControlPanel(QWidget):
         ai2_layout.setSpacing(5)
         
         ai2_label = QLabel("AI-2 Model")
-        ai2_label.setStyleSheet(f"color: {COLORS['text_dim']}; font-size: 12px;")
+        ai2_label.setObjectName("fieldLabel")
         ai2_layout.addWidget(ai2_label)
         
         self.ai2_model_selector = QComboBox()
-        self.ai2_model_selector.setStyleSheet(self.get_combobox_style())
         ai2_layout.addWidget(self.ai2_model_selector)
         
         middle_column.addWidget(ai2_container)
@@ -923,11 +1841,10 @@ class ControlPanel(QWidget):
         prompt_layout.setSpacing(5)
         
         prompt_label = QLabel("Conversation Scenario")
-        prompt_label.setStyleSheet(f"color: {COLORS['text_dim']}; font-size: 12px;")
+        prompt_label.setObjectName("fieldLabel")
         prompt_layout.addWidget(prompt_label)
         
         self.prompt_pair_selector = QComboBox()
-        self.prompt_pair_selector.setStyleSheet(self.get_combobox_style())
         prompt_layout.addWidget(self.prompt_pair_selector)
         
         right_column.addWidget(prompt_container)
@@ -939,28 +1856,11 @@ class ControlPanel(QWidget):
         action_layout.setSpacing(5)
         
         action_label = QLabel("Actions")
-        action_label.setStyleSheet(f"color: {COLORS['text_dim']}; font-size: 12px;")
+        action_label.setObjectName("fieldLabel")
         action_layout.addWidget(action_label)
         
         # Auto-generate images checkbox
         self.auto_image_checkbox = QCheckBox("Auto-generate images")
-        self.auto_image_checkbox.setStyleSheet(f"""
-            QCheckBox {{
-                color: {COLORS['text_normal']};
-                spacing: 5px;
-            }}
-            QCheckBox::indicator {{
-                width: 16px;
-                height: 16px;
-                border: 1px solid {COLORS['border']};
-                border-radius: 3px;
-                background-color: {COLORS['bg_light']};
-            }}
-            QCheckBox::indicator:checked {{
-                background-color: {COLORS['accent_blue']};
-                border: 1px solid {COLORS['accent_blue']};
-            }}
-        """)
         self.auto_image_checkbox.setToolTip("Automatically generate images from AI responses using OpenAI's GPT-image-1 model")
         action_layout.addWidget(self.auto_image_checkbox)
         
@@ -1061,55 +1961,35 @@ class ControlPanel(QWidget):
     
     def get_combobox_style(self):
         """Get the style for comboboxes"""
-        return f"""
-            QComboBox {{
-                background-color: {COLORS['bg_light']};
-                color: {COLORS['text_normal']};
-                border: 1px solid {COLORS['border']};
-                border-radius: 4px;
-                padding: 5px 10px;
-                min-width: 150px;
-            }}
-            QComboBox::drop-down {{
-                subcontrol-origin: padding;
-                subcontrol-position: top right;
-                width: 20px;
-                border-left: 1px solid {COLORS['border']};
-                border-top-right-radius: 4px;
-                border-bottom-right-radius: 4px;
-            }}
-            QComboBox::down-arrow {{
-                width: 12px;
-                height: 12px;
-                image: none;
-            }}
-            QComboBox QAbstractItemView {{
-                background-color: {COLORS['bg_medium']};
-                color: {COLORS['text_normal']};
-                selection-background-color: {COLORS['accent_blue']};
-                selection-color: {COLORS['text_bright']};
-                border: 1px solid {COLORS['border']};
-                border-radius: 0px;
-            }}
-        """
+        return COMBOBOX_STYLE
     
     def initialize_selectors(self):
         """Initialize the selector dropdowns with values from config"""
         # Add AI models
         self.ai1_model_selector.clear()
         self.ai2_model_selector.clear()
-        self.ai1_model_selector.addItems(list(AI_MODELS.keys()))
-        self.ai2_model_selector.addItems(list(AI_MODELS.keys()))
+        self.ai1_model_selector.addItems(MODEL_NAMES)
+        self.ai2_model_selector.addItems(MODEL_NAMES)
 
         # Add prompt pairs
         self.prompt_pair_selector.clear()
-        self.prompt_pair_selector.addItems(list(SYSTEM_PROMPT_PAIRS.keys()))
+        self.prompt_pair_selector.addItems(PROMPT_PAIR_NAMES)
 
     def open_html_document(self, filename, display_name):
-        """Open HTML document with proper error handling"""
-        import os
-
-        if not os.path.exists(filename):
+        """Open HTML document with proper error handling
+        
+        The existence check runs on the thread pool, so a slow filesystem can't stall the UI;
+        the browser or warning follows once it reports back.
+        """
+        task = BackgroundTask(os.path.exists, filename)
+        task.signals.result.connect(lambda exists: self._on_html_checked(task, filename, display_name, exists))
+        self._stat_tasks.add(task)
+        QThreadPool.globalInstance().start(task)
+    
+    def _on_html_checked(self, task, filename, display_name, exists):
+        """Open the HTML document if it exists, otherwise explain why it can't be opened"""
+        self._stat_tasks.discard(task)
+        if not exists:
             # Show warning dialog
             msg = QMessageBox()
             msg.setIcon(QMessageBox.Icon.Warning)
@@ -1173,7 +2053,7 @@ class ConversationContextMenu(QMenu):
         if self.parent() and hasattr(self.parent(), 'rabbithole_from_selection'):
             cursor = self.parent().conversation_display.textCursor()
             selected_text = cursor.selectedText()
-            if selected_text and hasattr(self.parent(), 'rabbithole_callback'):
+            if selected_text and self.parent().rabbithole_callback is not None:
                 self.parent().rabbithole_callback(selected_text)
     
     def on_fork_selected(self):
@@ -1181,11 +2061,14 @@ class ConversationContextMenu(QMenu):
         if self.parent() and hasattr(self.parent(), 'fork_from_selection'):
             cursor = self.parent().conversation_display.textCursor()
             selected_text = cursor.selectedText()
-            if selected_text and hasattr(self.parent(), 'fork_callback'):
+            if selected_text and self.parent().fork_callback is not None:
                 self.parent().fork_callback(selected_text)
 
 class ConversationPane(QWidget):
     """Left pane containing the conversation and input area"""
+    # Char formats for appended text, built once (after the QApplication exists) and shared
+    _text_formats = None
+    
     def __init__(self):
         super().__init__()
         
@@ -1202,46 +2085,93 @@ class ConversationPane(QWidget):
         self.fork_callback = None
         self.loading = False
         self.loading_dots = 0
+        self.pulse_animation = None  # Created by start_loading()
+        self.animations_paused = False
         self.loading_timer = QTimer()
         self.loading_timer.timeout.connect(self.update_loading_animation)
         self.loading_timer.setInterval(300)  # Update every 300ms for smoother animation
         
+        # Rendered HTML keyed by conversation fingerprint (LRU), and per message by message fingerprint
+        self._render_cache = OrderedDict()
+        self._message_html_cache = OrderedDict()
+        
+        # Images load on the thread pool; running tasks are referenced here until they report back.
+        # The generation counter changes whenever the document is rebuilt, so late results are dropped
+        self._image_tasks = set()
+        self._document_generation = 0
+        
+        # Decoded images keyed by (source, display width) - LRU, owns the decoded references
+        self._image_cache = OrderedDict()
+        
+        # Export writes running on the thread pool
+        self._export_tasks = set()
+        
+        # Appended text is queued and written in one batch per frame (~60 fps)
+        self._pending_text = []
+        self._text_flush_timer = QTimer(self)
+        self._text_flush_timer.setSingleShot(True)
+        self._text_flush_timer.setInterval(16)
+        self._text_flush_timer.timeout.connect(self.flush_pending_text)
+        
+        # Conversation updates are rendered once per frame too, however many arrive in it
+        self._render_pending = False
+        self._render_timer = QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setInterval(16)
+        self._render_timer.timeout.connect(self.flush_render)
+        
         # Context menu
         self.context_menu = ConversationContextMenu(self)
         
+        # Images in the display, by document resource name -> cursor just past the image.
+        # The document owns the pixels; this only lets us release the ones trimmed off the top.
+        self.images = OrderedDict()
+        self._image_seq = 0
+        self.image_paths = deque(maxlen=MAX_RETAINED_IMAGE_PATHS)
+        
+        # What the display shows from the last render: the conversation fingerprint, and the
+        # document revision right after it (anything written since makes a full render necessary)
+        self._rendered_fingerprint = None
+        self._rendered_revision = None
+        
         # Initialize with empty conversation
         self.update_conversation([])
-        
-        # Images list - to prevent garbage collection
-        self.images = []
-        self.image_paths = []
-
-        # Create text formats with different colors
-        self.text_formats = {
-            "user": QTextCharFormat(),
-            "ai": QTextCharFormat(),
-            "system": QTextCharFormat(),
-            "ai_label": QTextCharFormat(),
-            "normal": QTextCharFormat(),
-            "error": QTextCharFormat(),
-            "header": QTextCharFormat(),
-            "chain_of_thought": QTextCharFormat()
-        }
 
-        # Configure text formats using global color palette
-        self.text_formats["user"].setForeground(QColor(COLORS['text_normal']))
-        self.text_formats["ai"].setForeground(QColor(COLORS['text_normal']))
-        self.text_formats["system"].setForeground(QColor(COLORS['text_normal']))
-        self.text_formats["ai_label"].setForeground(QColor(COLORS['accent_blue']))
-        self.text_formats["normal"].setForeground(QColor(COLORS['text_normal']))
-        self.text_formats["error"].setForeground(QColor(COLORS['text_error']))
-        self.text_formats["header"].setForeground(QColor(COLORS['ai_header']))
-        self.text_formats["header"].setFontWeight(QFont.Weight.Bold)
-        self.text_formats["chain_of_thought"].setForeground(QColor(COLORS['chain_of_thought']))
-        self.text_formats["chain_of_thought"].setFontItalic(True)
-        
-        # Make AI labels bold
-        self.text_formats["ai_label"].setFontWeight(QFont.Weight.Bold)
+        # Text formats, shared by every pane; the dict is copied so callers can add their own
+        self.text_formats = dict(self._get_text_formats())
+    
+    @classmethod
+    def _get_text_formats(cls):
+        """The shared text formats by format type, building them on first use"""
+        if cls._text_formats is None:
+            # Create text formats with different colors
+            text_formats = {
+                "user": QTextCharFormat(),
+                "ai": QTextCharFormat(),
+                "system": QTextCharFormat(),
+                "ai_label": QTextCharFormat(),
+                "normal": QTextCharFormat(),
+                "error": QTextCharFormat(),
+                "header": QTextCharFormat(),
+                "chain_of_thought": QTextCharFormat()
+            }
+            
+            # Configure text formats using global color palette
+            text_formats["user"].setForeground(QColor(COLORS['text_normal']))
+            text_formats["ai"].setForeground(QColor(COLORS['text_normal']))
+            text_formats["system"].setForeground(QColor(COLORS['text_normal']))
+            text_formats["ai_label"].setForeground(QColor(COLORS['accent_blue']))
+            text_formats["normal"].setForeground(QColor(COLORS['text_normal']))
+            text_formats["error"].setForeground(QColor(COLORS['text_error']))
+            text_formats["header"].setForeground(QColor(COLORS['ai_header']))
+            text_formats["header"].setFontWeight(QFont.Weight.Bold)
+            text_formats["chain_of_thought"].setForeground(QColor(COLORS['chain_of_thought']))
+            text_formats["chain_of_thought"].setFontItalic(True)
+            
+            # Make AI labels bold
+            text_formats["ai_label"].setFontWeight(QFont.Weight.Bold)
+            cls._text_formats = text_formats
+        return cls._text_formats
     
     def setup_ui(self):
         """Set up the user interface for the conversation pane"""
@@ -1276,6 +2206,8 @@ class ConversationPane(QWidget):
         # Conversation display (read-only text edit in a scroll area)
         self.conversation_display = QTextEdit()
         self.conversation_display.setReadOnly(True)
+        # Read-only transcript: don't let programmatic inserts build an ever-growing undo stack
+        self.conversation_display.setUndoRedoEnabled(False)
         self.conversation_display.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.conversation_display.customContextMenuRequested.connect(self.show_context_menu)
         
@@ -1372,27 +2304,7 @@ class ConversationPane(QWidget):
         
         # Submit button with modern styling
         self.submit_button = QPushButton("Propagate")
-        self.submit_button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLORS['accent_blue']};
-                color: {COLORS['text_bright']};
-                border: none;
-                border-radius: 4px;
-                padding: 4px 12px;
-                font-weight: bold;
-                font-size: 11px;
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS['accent_blue_hover']};
-            }}
-            QPushButton:pressed {{
-                background-color: {COLORS['accent_blue_active']};
-            }}
-            QPushButton:disabled {{
-                background-color: {COLORS['border']};
-                color: {COLORS['text_dim']};
-            }}
-        """)
+        self.submit_button.setStyleSheet(SUBMIT_BUTTON_STYLE)
         
         # Add buttons to layout
         button_layout.addWidget(self.clear_button)
@@ -1428,7 +2340,8 @@ class ConversationPane(QWidget):
     
     def eventFilter(self, obj, event):
         """Filter events to handle Enter key in input field"""
-        if obj is self.input_field and event.type() == QEvent.Type.KeyPress:
+        # Cheapest test first - this sees every event the input field receives (paints, moves, ...)
+        if event.type() == QEvent.Type.KeyPress and obj is self.input_field:
             if event.key() == Qt.Key.Key_Return and not event.modifiers() & Qt.KeyboardModifier.ShiftModifier:
                 self.handle_propagate_click()
                 return True
@@ -1443,7 +2356,7 @@ class ConversationPane(QWidget):
         self.input_field.clear()
         
         # Always call the input callback, even with empty input
-        if hasattr(self, 'input_callback') and self.input_callback:
+        if self.input_callback is not None:
             self.input_callback(input_text)
         
         # Start loading animation
@@ -1462,158 +2375,245 @@ class ConversationPane(QWidget):
         self.fork_callback = callback
     
     def update_conversation(self, conversation):
-        """Update conversation display"""
+        """Update conversation display (rendered on the next frame)"""
         self.conversation = conversation
-        self.render_conversation()
+        self.schedule_render()
+    
+    def schedule_render(self):
+        """Render the conversation on the next frame, once for any number of calls before it
+        
+        Text queued before this call is dropped, as the render would have wiped it; text queued
+        after it is written after the render.
+        """
+        self._discard_pending_text()
+        self._render_pending = True
+        if not self._render_timer.isActive():
+            self._render_timer.start()
+    
+    def flush_render(self):
+        """Run a scheduled render now, if there is one - before anything else writes to the display"""
+        if not self._render_pending:
+            return
+        self._render_pending = False
+        self._render_timer.stop()
+        with self._display_frozen():
+            self._render_document()
+    
+    @contextmanager
+    def _display_frozen(self):
+        """Hold off painting the display while its document is changed, then repaint it once"""
+        display = self.conversation_display
+        display.setUpdatesEnabled(False)
+        try:
+            yield display
+        finally:
+            display.setUpdatesEnabled(True)
+            display.viewport().update()
+    
+    @contextmanager
+    def _block_limit(self):
+        """Bound the document while streamed text is appended, so layout cost per insert stays flat
+        
+        Only these appends are trimmed - renders leave the limit off, so a rebuilt document
+        always starts at the first message.
+        """
+        document = self.conversation_display.document()
+        document.setMaximumBlockCount(MAX_TEXT_BLOCKS)
+        try:
+            yield document
+        finally:
+            document.setMaximumBlockCount(0)
     
     def render_conversation(self):
-        """Render conversation in the display"""
+        """Render conversation in the display now, repainting it once"""
+        self.schedule_render()
+        self.flush_render()
+    
+    def _render_document(self):
+        """Bring the display's document up to date with the conversation
+        
+        If messages were only appended since the last render, and nothing else was written to
+        the display since, just the new messages are inserted; otherwise the document is rebuilt.
+        """
+        fingerprint = self._conversation_fingerprint()
+        document = self.conversation_display.document()
+        rendered = self._rendered_fingerprint
+        if (fingerprint is not None and rendered and len(fingerprint) > len(rendered)
+                and document.revision() == self._rendered_revision and not document.isEmpty()
+                and fingerprint[:len(rendered)] == rendered):
+            self._append_messages(self.conversation[len(rendered):])
+            self._rendered_fingerprint = fingerprint
+            self._rendered_revision = document.revision()
+            return
+        
         # Clear display
+        self._document_generation += 1
         self.conversation_display.clear()
+        self.images.clear()
         
-        # Create HTML for conversation with modern styling
-        html = "<style>"
-        html += f"body {{ font-family: 'Segoe UI', sans-serif; font-size: 10pt; line-height: 1.4; }}"
-        html += f".message {{ margin-bottom: 10px; padding: 8px; border-radius: 4px; }}"
-        html += f".user {{ background-color: {COLORS['bg_medium']}; }}"
-        html += f".assistant {{ background-color: {COLORS['bg_medium']}; }}"
-        html += f".system {{ background-color: {COLORS['bg_medium']}; font-style: italic; }}"
-        html += f".header {{ font-weight: bold; margin: 10px 0; color: {COLORS['accent_blue']}; }}"
-        html += f".content {{ white-space: pre-wrap; color: {COLORS['text_normal']}; }}"
-        html += f".branch-indicator {{ color: {COLORS['text_dim']}; font-style: italic; text-align: center; margin: 8px 0; }}"
-        html += f".rabbithole {{ color: {COLORS['accent_green']}; }}"
-        html += f".fork {{ color: {COLORS['accent_yellow']}; }}"
-        html += f".cot-label {{ font-weight: bold; color: {COLORS['chain_of_thought']}; margin-top: 6px; }}"
-        html += f".cot-body {{ color: {COLORS['chain_of_thought']}; margin-top: 4px; white-space: pre-wrap; }}"
-        html += f".cot-final {{ margin-top: 6px; white-space: pre-wrap; }}"
-        html += f".cot-container {{ background-color: {COLORS['bg_dark']}; border-left: 3px solid {COLORS['chain_of_thought']}; padding: 8px; border-radius: 4px; margin-top: 8px; }}"
-        # Removed HTML contribution styling
-        html += f"pre {{ background-color: {COLORS['bg_dark']}; border: 1px solid {COLORS['border']}; border-radius: 3px; padding: 8px; overflow-x: auto; margin: 8px 0; }}"
-        html += f"code {{ font-family: 'Consolas', 'Courier New', monospace; color: {COLORS['text_bright']}; }}"
-        html += "</style>"
-        
-        for i, message in enumerate(self.conversation):
-            role = message.get("role", "")
-            content = message.get("content", "")
-            final_content = message.get("final_content", content)
-            ai_name = message.get("ai_name", "")
-            model = message.get("model", "")
-            
-            # Skip empty messages
-            if not (content or final_content):
-                continue
-                
-            # Handle branch indicators with special styling
-            if role == 'system' and message.get('_type') == 'branch_indicator':
-                if "Rabbitholing down:" in content:
-                    html += f'<div class="branch-indicator rabbithole">{content}</div>'
-                elif "Forking off:" in content:
-                    html += f'<div class="branch-indicator fork">{content}</div>'
-                continue
-            
-            # Removed HTML contribution indicator logic
-            
-            # Process content to handle code blocks
-            processed_final = self.process_content_with_code_blocks(final_content)
-            
-            # Format based on role
-            if role == 'user':
-                # User message
-                html += f'<div class="message user">'
-                html += f'<div class="content">{processed_final}</div>'
-                html += f'</div>'
-            elif role == 'assistant':
-                # AI message
-                display_name = ai_name
-                if model:
-                    display_name += f" ({model})"
-                html += f'<div class="message assistant">'
-                html += f'<div class="header">\n{display_name}\n</div>'
-                reasoning_text = message.get("reasoning")
-                if SHOW_CHAIN_OF_THOUGHT_IN_CONTEXT and reasoning_text:
-                    processed_reasoning = self.process_content_with_code_blocks(reasoning_text)
-                    html += (
-                        f'<div class="content">'
-                        f'<div class="cot-container">'
-                        f'<div class="cot-label">Chain of Thought</div>'
-                        f'<div class="cot-body">{processed_reasoning}</div>'
-                        f'<div class="cot-final">{processed_final}</div>'
-                        f'</div>'
-                        f'</div>'
-                    )
-                else:
-                    html += f'<div class="content">{processed_final}</div>'
-                
-                # Removed HTML contribution indicator
-                
-                html += f'</div>'
-            elif role == 'system':
-                # System message
-                html += f'<div class="message system">'
-                html += f'<div class="content">{processed_final}</div>'
-                html += f'</div>'
+        # Reuse the HTML of an earlier render with identical content (e.g. switching back to a branch)
+        html = self._render_cache.get(fingerprint) if fingerprint is not None else None
+        if html is not None:
+            self._render_cache.move_to_end(fingerprint)
+        else:
+            html = self._build_conversation_html()
+            if fingerprint is not None:
+                self._render_cache[fingerprint] = html
+                if len(self._render_cache) > MAX_CACHED_RENDERS:
+                    self._render_cache.popitem(last=False)
         
         # Set HTML in display
         self.conversation_display.setHtml(html)
+        self._rendered_fingerprint = fingerprint
+        self._rendered_revision = document.revision()
         
         # Scroll to bottom
         self.conversation_display.verticalScrollBar().setValue(
             self.conversation_display.verticalScrollBar().maximum()
         )
     
-    def process_content_with_code_blocks(self, content):
-        """Process content to properly format code blocks"""
-        import re
-        from html import escape
-        
-        # First, escape HTML in the content
-        escaped_content = escape(content)
-        
-        # Check if there are any code blocks in the content
-        if "```" not in escaped_content:
-            return escaped_content
-        
-        # Split the content by code block markers
-        parts = re.split(r'(```(?:[a-zA-Z0-9_]*)\n.*?```)', escaped_content, flags=re.DOTALL)
-        
-        result = []
-        for part in parts:
-            if part.startswith("```") and part.endswith("```"):
-                # This is a code block
-                try:
-                    # Extract language if specified
-                    language_match = re.match(r'```([a-zA-Z0-9_]*)\n', part)
-                    language = language_match.group(1) if language_match else ""
-                    
-                    # Extract code content
-                    code_content = part[part.find('\n')+1:part.rfind('```')]
-                    
-                    # Format as HTML
-                    formatted_code = f'<pre><code class="language-{language}">{code_content}</code></pre>'
-                    result.append(formatted_code)
-                except Exception as e:
-                    # If there's an error, just add the original escaped content
-                    print(f"Error processing code block: {e}")
-                    result.append(part)
+    def _append_messages(self, messages):
+        """Insert the HTML of messages at the end of the display, laying out only the new blocks"""
+        html = ''.join(self._build_message_html(message) for message in messages)
+        if html:
+            # Parsed on its own, with the style block. Inserting it would merge its first block
+            # into the document's last one, so that block is started with its own formats first.
+            fragment = QTextDocument()
+            fragment.setHtml(CONVERSATION_STYLE + html)
+            first = fragment.firstBlock()
+            cursor = QTextCursor(self.conversation_display.document())
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.beginEditBlock()
+            cursor.insertBlock(first.blockFormat(), first.charFormat())
+            cursor.insertFragment(QTextDocumentFragment(fragment))
+            cursor.endEditBlock()
+        
+        # Scroll to bottom
+        self.conversation_display.verticalScrollBar().setValue(
+            self.conversation_display.verticalScrollBar().maximum()
+        )
+    
+    def _conversation_fingerprint(self, conversation=None):
+        """Hashable key of everything the rendered HTML depends on, or None if not hashable"""
+        if conversation is None:
+            conversation = self.conversation
+        fingerprint = tuple(map(self._message_fingerprint, conversation))
+        try:
+            hash(fingerprint)
+        except TypeError:
+            # Multimodal content (lists of parts) - render without caching
+            return None
+        return fingerprint
+    
+    def forget_render(self, conversation):
+        """Evict the cached HTML of a conversation that is no longer likely to be shown"""
+        fingerprint = self._conversation_fingerprint(conversation)
+        if fingerprint is not None:
+            self._render_cache.pop(fingerprint, None)
+    
+    @staticmethod
+    def _message_fingerprint(message):
+        """Everything a message's rendered HTML depends on"""
+        return (message.get("role"), message.get("content"), message.get("final_content"),
+                message.get("reasoning"), message.get("_type"), message.get("ai_name"), message.get("model"))
+    
+    def _build_conversation_html(self):
+        """Build the HTML document for the current conversation
+        
+        Messages rendered before are reused from the per-message cache, so after a new
+        message only that one is built.
+        """
+        # Create HTML for conversation with modern styling - pieces are joined once at the end
+        parts = [CONVERSATION_STYLE]
+        cache = self._message_html_cache
+        
+        for message in self.conversation:
+            key = self._message_fingerprint(message)
+            try:
+                html = cache.get(key)
+            except TypeError:
+                # Multimodal content (lists of parts) - build without caching
+                parts.append(self._build_message_html(message))
+                continue
+            if html is None:
+                html = cache[key] = self._build_message_html(message)
+                if len(cache) > MAX_CACHED_MESSAGES:
+                    cache.popitem(last=False)
             else:
-                # Process inline code in non-code-block parts
-                inline_parts = re.split(r'(`[^`]+`)', part)
-                processed_part = []
-                
-                for inline_part in inline_parts:
-                    if inline_part.startswith("`") and inline_part.endswith("`") and len(inline_part) > 2:
-                        # This is inline code
-                        code = inline_part[1:-1]
-                        processed_part.append(f'<code>{code}</code>')
-                    else:
-                        processed_part.append(inline_part)
-                
-                result.append(''.join(processed_part))
+                cache.move_to_end(key)
+            parts.append(html)
+        
+        return ''.join(parts)
+    
+    def _build_message_html(self, message):
+        """HTML fragment for one message ('' if it isn't displayed)"""
+        parts = []
+        role = message.get("role", "")
+        content = message.get("content", "")
+        final_content = message.get("final_content", content)
+        ai_name = message.get("ai_name", "")
+        model = message.get("model", "")
+        
+        # Skip empty messages
+        if not (content or final_content):
+            return ''
+            
+        # Handle branch indicators with special styling
+        if role == 'system' and message.get('_type') == 'branch_indicator':
+            if "Rabbitholing down:" in content:
+                parts.append(f'<div class="branch-indicator rabbithole">{content}</div>')
+            elif "Forking off:" in content:
+                parts.append(f'<div class="branch-indicator fork">{content}</div>')
+            return ''.join(parts)
+        
+        # Removed HTML contribution indicator logic
+        
+        # Process content to handle code blocks
+        processed_final = self.process_content_with_code_blocks(final_content)
+        
+        # Format based on role
+        if role in MESSAGE_OPEN_HTML:
+            # User or system message
+            parts.append(MESSAGE_OPEN_HTML[role])
+            parts.append(processed_final)
+            parts.append(MESSAGE_CLOSE_HTML)
+        elif role == 'assistant':
+            # AI message
+            display_name = ai_name
+            if model:
+                display_name += f" ({model})"
+            parts.append('<div class="message assistant">')
+            parts.append(f'<div class="header">\n{display_name}\n</div>')
+            reasoning_text = message.get("reasoning")
+            if SHOW_CHAIN_OF_THOUGHT_IN_CONTEXT and reasoning_text:
+                processed_reasoning = self.process_content_with_code_blocks(reasoning_text)
+                parts.append(
+                    f'<div class="content">'
+                    f'<div class="cot-container">'
+                    f'<div class="cot-label">Chain of Thought</div>'
+                    f'<div class="cot-body">{processed_reasoning}</div>'
+                    f'<div class="cot-final">{processed_final}</div>'
+                    f'</div>'
+                    f'</div>'
+                )
+            else:
+                parts.append(f'<div class="content">{processed_final}</div>')
+            
+            # Removed HTML contribution indicator
+            
+            parts.append('</div>')
         
-        return ''.join(result)
+        return ''.join(parts)
+    
+    def process_content_with_code_blocks(self, content):
+        """Process content to properly format code blocks"""
+        return _format_content(content)
     
     def start_loading(self):
         """Start loading animation"""
+        # Already loading (e.g. the input callback started it) - don't rebuild the widgets' state
+        if self.loading:
+            return
         self.loading = True
         self.loading_dots = 0
         self.input_field.setEnabled(False)
@@ -1621,39 +2621,27 @@ class ConversationPane(QWidget):
         self.submit_button.setText("Processing")
         self.loading_timer.start()
         
-        # Add subtle pulsing animation to the button
-        self.pulse_animation = QPropertyAnimation(self.submit_button, b"styleSheet")
+        # Add subtle pulsing animation to the button - the style is set once, and the pulse
+        # tweens a colorize effect's strength, so no stylesheet is parsed per frame
+        self.submit_button.setStyleSheet(SUBMIT_BUTTON_LOADING_STYLE)
+        pulse_effect = QGraphicsColorizeEffect(self.submit_button)
+        pulse_effect.setColor(QColor(COLORS['border_highlight']))
+        pulse_effect.setStrength(0.0)
+        self.submit_button.setGraphicsEffect(pulse_effect)
+        self.pulse_animation = QPropertyAnimation(pulse_effect, b"strength")
         self.pulse_animation.setDuration(1000)
         self.pulse_animation.setLoopCount(-1)  # Infinite loop
         
-        # Define keyframes for the animation
-        normal_style = f"""
-            QPushButton {{
-                background-color: {COLORS['border']};
-                color: {COLORS['text_dim']};
-                border: none;
-                border-radius: 4px;
-                padding: 4px 12px;
-                font-weight: bold;
-                font-size: 11px;
-            }}
-        """
-        
-        pulse_style = f"""
-            QPushButton {{
-                background-color: {COLORS['border_highlight']};
-                color: {COLORS['text_dim']};
-                border: none;
-                border-radius: 4px;
-                padding: 4px 12px;
-                font-weight: bold;
-                font-size: 11px;
-            }}
-        """
-        
-        self.pulse_animation.setStartValue(normal_style)
-        self.pulse_animation.setEndValue(pulse_style)
+        # Keyframes for the animation
+        self.pulse_animation.setStartValue(0.0)
+        self.pulse_animation.setKeyValueAt(0.5, 1.0)
+        self.pulse_animation.setEndValue(0.0)
         self.pulse_animation.start()
+        
+        # Started while minimized - hold the animation until the window is restored
+        if self.animations_paused:
+            self.loading_timer.stop()
+            self.pulse_animation.pause()
     
     def stop_loading(self):
         """Stop loading animation"""
@@ -1663,34 +2651,31 @@ class ConversationPane(QWidget):
         self.submit_button.setEnabled(True)
         self.submit_button.setText("Propagate")
         
-        # Stop the pulsing animation
-        if hasattr(self, 'pulse_animation'):
+        # Stop the pulsing animation (removing the effect deletes it)
+        if self.pulse_animation is not None:
             self.pulse_animation.stop()
+            self.pulse_animation = None
+        self.submit_button.setGraphicsEffect(None)
             
         # Reset button style
-        self.submit_button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLORS['accent_blue']};
-                color: {COLORS['text_bright']};
-                border: none;
-                border-radius: 4px;
-                padding: 4px 12px;
-                font-weight: bold;
-                font-size: 11px;
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS['accent_blue_hover']};
-            }}
-            QPushButton:pressed {{
-                background-color: {COLORS['accent_blue_active']};
-            }}
-        """)
+        self.submit_button.setStyleSheet(SUBMIT_BUTTON_STYLE)
+    
+    def set_animations_paused(self, paused):
+        """Suspend the loading animation (e.g. while minimized) without leaving the loading state"""
+        self.animations_paused = paused
+        if not self.loading:
+            return
+        if paused:
+            self.loading_timer.stop()
+            self.pulse_animation.pause()
+        else:
+            self.loading_timer.start()
+            self.pulse_animation.resume()
     
     def update_loading_animation(self):
         """Update loading animation dots"""
-        self.loading_dots = (self.loading_dots + 1) % 4
-        dots = "." * self.loading_dots
-        self.submit_button.setText(f"Processing{dots}")
+        self.loading_dots = (self.loading_dots + 1) & 3
+        self.submit_button.setText(LOADING_FRAMES[self.loading_dots])
     
     def show_context_menu(self, position):
         """Show context menu at the given position"""
@@ -1708,7 +2693,7 @@ class ConversationPane(QWidget):
         cursor = self.conversation_display.textCursor()
         selected_text = cursor.selectedText()
         
-        if selected_text and hasattr(self, 'rabbithole_callback'):
+        if selected_text and self.rabbithole_callback is not None:
             self.rabbithole_callback(selected_text)
     
     def fork_from_selection(self):
@@ -1716,11 +2701,40 @@ class ConversationPane(QWidget):
         cursor = self.conversation_display.textCursor()
         selected_text = cursor.selectedText()
         
-        if selected_text and hasattr(self, 'fork_callback'):
+        if selected_text and self.fork_callback is not None:
             self.fork_callback(selected_text)
     
     def append_text(self, text, format_type="normal"):
-        """Append text to the conversation display with the specified format"""
+        """Queue text for the conversation display; writes are flushed once per frame"""
+        self._pending_text.append((text, format_type))
+        if not self._text_flush_timer.isActive():
+            self._text_flush_timer.start()
+    
+    def flush_pending_text(self):
+        """Write all queued text to the display and scroll to the bottom once"""
+        self.flush_render()
+        self._text_flush_timer.stop()
+        if not self._pending_text:
+            return
+        pending, self._pending_text = self._pending_text, []
+        
+        # One edit block for the whole batch - the document lays out once at the end -
+        # with consecutive same-format chunks merged into a single insert
+        with self._display_frozen() as display, self._block_limit():
+            batch = QTextCursor(display.document())
+            batch.beginEditBlock()
+            for format_type, run in groupby(pending, key=itemgetter(1)):
+                cursor = self._insert_text(''.join(text for text, _ in run), format_type)
+            batch.endEditBlock()
+            
+            self._release_trimmed_images()
+            
+            # Scroll to bottom
+            display.setTextCursor(cursor)
+            display.ensureCursorVisible()
+    
+    def _insert_text(self, text, format_type):
+        """Insert text at the end of the display with the specified format"""
         cursor = self.conversation_display.textCursor()
         cursor.movePosition(QTextCursor.MoveOperation.End)
         
@@ -1735,21 +2749,27 @@ class ConversationPane(QWidget):
         if format_type != "normal":
             self.conversation_display.setCurrentCharFormat(self.text_formats["normal"])
         
-        # Scroll to bottom
-        self.conversation_display.setTextCursor(cursor)
-        self.conversation_display.ensureCursorVisible()
+        return cursor
+    
+    def _discard_pending_text(self):
+        """Drop queued appends that haven't been written yet"""
+        self._text_flush_timer.stop()
+        self._pending_text.clear()
     
     def clear_conversation(self):
         """Clear the conversation display"""
+        self._discard_pending_text()
+        # A render still waiting would be wiped anyway
+        self._render_pending = False
+        self._render_timer.stop()
+        self._document_generation += 1
         self.conversation_display.clear()
-        self.images = []
+        self.images.clear()
+        self._image_cache.clear()
         
     def display_conversation(self, conversation, branch_data=None):
         """Display the conversation in the text edit widget"""
-        # Clear the current text
-        self.conversation_display.clear()
-        
-        # Store conversation data
+        # Store conversation data (render_conversation clears the display if it has to)
         self.conversation = conversation
         
         # Check if we're in a branch
@@ -1766,56 +2786,109 @@ class ConversationPane(QWidget):
             self.title_label.setText("Liminal Backrooms")
             self.info_label.setText("AI-to-AI conversation")
         
-        # Debug: Print conversation to console
-        print("\n--- DEBUG: Conversation Content ---")
-        for msg in conversation:
-            role = msg.get("role", "")
-            content = msg.get("content", "")
-            if "```" in content:
-                print(f"Found code block in {role} message")
-                print(f"Content snippet: {content[:100]}...")
-        print("--- End Debug ---\n")
+        # Render conversation on the next frame
+        self.schedule_render()
         
-        # Render conversation
-        self.render_conversation()
+    def display_image(self, image_path, image_data=None):
+        """Display an image in the conversation, loading it in the background (image_data avoids a disk read)"""
+        if not image_path:
+            self.append_text("[Image not found]\n", "error")
+            return
         
-    def display_image(self, image_path):
-        """Display an image in the conversation"""
+        # Anchor the insertion point now, after any queued text, so text appended while
+        # the image loads still follows it
+        self.flush_pending_text()
+        anchor = QTextCursor(self.conversation_display.document())
+        anchor.movePosition(QTextCursor.MoveOperation.End)
+        anchor.setKeepPositionOnInsert(True)
+        generation = self._document_generation
+        
+        # Never below 1px - before the first layout the display can be narrower than the margin
+        max_width = max(1, self.conversation_display.width() - 50)
+        
+        # Images shown before at this width are reused without decoding again
+        cache_key = (image_path, max_width)
+        cached = self._image_cache.get(cache_key)
+        if cached is not None:
+            self._image_cache.move_to_end(cache_key)
+            self._insert_image(*cached, anchor)
+            return
+        
+        task = BackgroundTask(_load_image, image_path, max_width, image_data)
+        task.signals.result.connect(lambda result: self._on_image_loaded(task, cache_key, result, anchor, generation))
+        task.signals.error.connect(lambda error: self._on_image_error(task, error, generation))
+        self._image_tasks.add(task)
+        QThreadPool.globalInstance().start(task)
+    
+    def _on_image_loaded(self, task, cache_key, result, anchor, generation):
+        """Cache a decoded image and insert it, unless the document was re-rendered meanwhile"""
+        self._image_tasks.discard(task)
+        self._image_cache[cache_key] = result
+        if len(self._image_cache) > MAX_CACHED_IMAGES:
+            self._image_cache.popitem(last=False)
+        
+        if generation == self._document_generation:
+            self._insert_image(*result, anchor)
+    
+    def _insert_image(self, image, image_path, anchor):
+        """Insert a decoded image at the anchor cursor"""
         try:
-            # Check if the image path is valid
-            if not image_path or not os.path.exists(image_path):
-                self.append_text("[Image not found]\n", "error")
-                return
-            
-            # Load the image
-            image = QImage(image_path)
-            if image.isNull():
-                self.append_text("[Invalid image format]\n", "error")
-                return
-            
-            # Create a pixmap from the image
-            pixmap = QPixmap.fromImage(image)
-            
-            # Scale the image to fit the conversation display
-            max_width = self.conversation_display.width() - 50
-            if pixmap.width() > max_width:
-                pixmap = pixmap.scaledToWidth(max_width, Qt.TransformationMode.SmoothTransformation)
-            
-            # Insert the image into the conversation display
-            cursor = self.conversation_display.textCursor()
-            cursor.movePosition(QTextCursor.MoveOperation.End)
-            cursor.insertImage(pixmap.toImage())
-            cursor.insertText("\n\n")
-            
-            # Store the image to prevent garbage collection
-            self.images.append(pixmap)
-            self.image_paths.append(image_path)
+            with self._display_frozen(), self._block_limit():
+                # Register the decoded image as a named resource and insert it as-is - the
+                # document shares its pixel data, so there is no QPixmap round trip copying it
+                document = self.conversation_display.document()
+                name = f"liminal-image://{self._image_seq}"
+                self._image_seq += 1
+                document.addResource(QTextDocument.ResourceType.ImageResource.value, QUrl(name), image)
+                # Insert through a fresh cursor: the anchor keeps its position on insert,
+                # so inserting through it would leave the image selected and the next insert would replace it
+                cursor = QTextCursor(document)
+                cursor.setPosition(anchor.position())
+                cursor.insertImage(name)
+                
+                # Track the image by a cursor right after it; it stays put for inserts there
+                # and collapses if the image's block is trimmed away
+                tracker = QTextCursor(document)
+                tracker.setPosition(cursor.position())
+                tracker.setKeepPositionOnInsert(True)
+                self.images[name] = tracker
+                
+                cursor.insertText("\n\n")
+                self.image_paths.append(image_path)
+                self._release_trimmed_images()
             
         except Exception as e:
             self.append_text(f"[Error displaying image: {str(e)}]\n", "error")
     
+    def _release_trimmed_images(self):
+        """Drop the document resources of images the block limit has trimmed off the top"""
+        # Trimming only happens once the document is at its block limit
+        document = self.conversation_display.document()
+        if document.blockCount() < MAX_TEXT_BLOCKS:
+            return
+        for name, tracker in list(self.images.items()):
+            char_format = tracker.charFormat()
+            if char_format.isImageFormat() and char_format.toImageFormat().name() == name:
+                # Oldest first - stop at the first one still shown
+                break
+            document.addResource(QTextDocument.ResourceType.ImageResource.value, QUrl(name), None)
+            del self.images[name]
+    
+    def _on_image_error(self, task, error, generation):
+        """Report an image that failed to load"""
+        self._image_tasks.discard(task)
+        if generation != self._document_generation:
+            return
+        if isinstance(error, ImageLoadError):
+            self.append_text(f"[{error}]\n", "error")
+        else:
+            self.append_text(f"[Error displaying image: {str(error)}]\n", "error")
+    
     def export_conversation(self):
         """Export the conversation to a file"""
+        # The export reads the display, so bring it up to date first
+        self.flush_render()
+        
         # Set default directory to user's documents folder or a custom exports folder
         default_dir = ""
         
@@ -1845,51 +2918,112 @@ class ConversationPane(QWidget):
         if not file_name:
             return  # User cancelled the dialog
         
+        # Make sure queued text is part of the exported document
+        self.flush_pending_text()
+        
         try:
             # Determine export format based on file extension
             _, ext = os.path.splitext(file_name)
         
             # Export as Full HTML Document
             if selected_filter == "Full HTML Document (*.html)":
-                # Copy the existing conversation_full.html file if it exists
+                # Copy the existing conversation_full.html file (falls back to regular HTML if missing)
                 full_html_path = os.path.join(os.getcwd(), "conversation_full.html")
-                if os.path.exists(full_html_path):
-                    shutil.copy2(full_html_path, file_name)
-                    print(f"Full HTML document exported to {file_name}")
-                    
-                    # Get main window
-                    main_window = self.window()
-                    main_window.statusBar().showMessage(f"Full HTML document exported to {file_name}")
-                    return
-                else:
-                    # Fallback to regular HTML if full document doesn't exist
-                    content = self.conversation_display.toHtml()
+                self.start_export(file_name, source_path=full_html_path)
+                return
             elif ext.lower() == '.html':
-                # Export as HTML - the QTextEdit already contains HTML formatting
-                content = self.conversation_display.toHtml()
+                # Export as HTML - built from the messages, the display may have been trimmed
+                content = self._export_html_document()
             elif ext.lower() == '.md':
-                # Export as Markdown - convert HTML to markdown
-                html_content = self.conversation_display.toHtml()
-                # Simple conversion for now (could be improved with a proper HTML->MD converter)
-                content = html_content.replace('<b>', '**').replace('</b>', '**')
-                content = re.sub(r'<[^>]*>', '', content)  # Remove other HTML tags
+                # Export as Markdown - written from the messages, no round trip through the document
+                content = self._conversation_to_markdown()
             else:
-                # Export as plain text
-                content = self.conversation_display.toPlainText()
+                # Export as plain text - the rendered messages, laid out as in the display
+                document = QTextDocument()
+                document.setHtml(self._build_conversation_html())
+                content = document.toPlainText()
             
-            # Write content to file
-            with open(file_name, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            # For status message - get main window
-            main_window = self.window()
-            main_window.statusBar().showMessage(f"Conversation exported to {file_name}")
-            print(f"Conversation exported to {file_name}")
+            # Write content to file in the background
+            self.start_export(file_name, content=content)
             
         except Exception as e:
-            error_msg = f"Error exporting conversation: {str(e)}"
-            QMessageBox.critical(self, "Export Error", error_msg)
-            print(error_msg)
+            self.show_export_error(e)
+    
+    def _export_html_document(self):
+        """The current conversation as a complete HTML document"""
+        body = self._build_conversation_html().removeprefix(CONVERSATION_STYLE)
+        return EXPORT_HTML_TEMPLATE.format(style=CONVERSATION_STYLE, body=body)
+    
+    def _conversation_to_markdown(self):
+        """Markdown for the current conversation: a heading per message, code blocks kept as written"""
+        parts = []
+        for message in self.conversation:
+            role = message.get("role", "")
+            content = message.get("content", "")
+            final_content = message.get("final_content", content)
+            if isinstance(final_content, list):
+                # Multimodal content - keep the text parts
+                final_content = "\n\n".join(part.get("text", "") for part in final_content
+                                              if isinstance(part, dict) and part.get("type") == "text")
+            
+            # Skip empty messages
+            if not final_content:
+                continue
+            
+            if role == 'system' and message.get('_type') == 'branch_indicator':
+                parts.append(f"*{final_content}*\n\n---\n\n")
+                continue
+            
+            if role == 'assistant':
+                heading = message.get("ai_name", "") or "Assistant"
+                model = message.get("model", "")
+                if model:
+                    heading += f" ({model})"
+            else:
+                heading = role.capitalize() or "Message"
+            parts.append(f"### {heading}\n\n")
+            
+            reasoning_text = message.get("reasoning")
+            if (role == 'assistant' and SHOW_CHAIN_OF_THOUGHT_IN_CONTEXT
+                    and isinstance(reasoning_text, str) and reasoning_text):
+                parts.append(f"**Chain of Thought**\n\n{reasoning_text}\n\n")
+            parts.append(f"{final_content}\n\n---\n\n")
+        return ''.join(parts)
+    
+    def start_export(self, file_name, content=None, source_path=None):
+        """Write (or copy) an export file on the thread pool, keeping the UI responsive"""
+        self.control_panel.export_button.setEnabled(False)
+        task = BackgroundTask(_write_export, file_name, content, source_path)
+        task.signals.result.connect(lambda _: self._on_export_finished(task, file_name, source_path))
+        task.signals.error.connect(lambda error: self._on_export_failed(task, error, file_name, source_path))
+        self._export_tasks.add(task)
+        QThreadPool.globalInstance().start(task)
+    
+    def _on_export_finished(self, task, file_name, source_path):
+        """Report a completed export"""
+        self._export_tasks.discard(task)
+        self.control_panel.export_button.setEnabled(True)
+        
+        # For status message - get main window
+        what = "Full HTML document" if source_path else "Conversation"
+        main_window = self.window()
+        main_window.statusBar().showMessage(f"{what} exported to {file_name}")
+        print(f"{what} exported to {file_name}")
+    
+    def _on_export_failed(self, task, error, file_name, source_path):
+        """Fall back to the display HTML if the full document is missing, otherwise report the error"""
+        self._export_tasks.discard(task)
+        self.control_panel.export_button.setEnabled(True)
+        if source_path and isinstance(error, FileNotFoundError) and not os.path.exists(source_path):
+            self.start_export(file_name, content=self._export_html_document())
+            return
+        self.show_export_error(error)
+    
+    def show_export_error(self, error):
+        """Show an export failure to the user"""
+        error_msg = f"Error exporting conversation: {str(error)}"
+        QMessageBox.critical(self, "Export Error", error_msg)
+        print(error_msg)
 
 class LiminalBackroomsApp(QMainWindow):
     """Main application window"""
@@ -1899,10 +3033,17 @@ class LiminalBackroomsApp(QMainWindow):
         # Main app state
         self.conversation = []
         self.turn_count = 0
-        self.images = []
-        self.image_paths = []
+        self.images = deque(maxlen=MAX_RETAINED_IMAGES)
+        self.image_paths = deque(maxlen=MAX_RETAINED_IMAGE_PATHS)
         self.branch_conversations = {}  # Store branch conversations by ID
         self.active_branch = None      # Currently displayed branch
+        self._branch_lru = OrderedDict()  # Branch IDs by recency of use (for releasing caches)
+        
+        # Coalesce splitter drags into a single settings write once the handle settles
+        self._splitter_save_timer = QTimer(self)
+        self._splitter_save_timer.setSingleShot(True)
+        self._splitter_save_timer.setInterval(300)
+        self._splitter_save_timer.timeout.connect(self.save_splitter_state)
         
         # Set up the UI
         self.setup_ui()
@@ -1938,16 +3079,6 @@ class LiminalBackroomsApp(QMainWindow):
         self.splitter = QSplitter(Qt.Orientation.Horizontal)
         self.splitter.setHandleWidth(8)  # Make the handle wider for easier grabbing
         self.splitter.setChildrenCollapsible(False)  # Prevent panes from being collapsed
-        self.splitter.setStyleSheet(f"""
-            QSplitter::handle {{
-                background-color: {COLORS['border']};
-                border: 1px solid {COLORS['border_highlight']};
-                border-radius: 2px;
-            }}
-            QSplitter::handle:hover {{
-                background-color: {COLORS['accent_blue']};
-            }}
-        """)
         main_layout.addWidget(self.splitter)
         
         # Create left pane (conversation) and right pane (network view)
@@ -1964,16 +3095,7 @@ class LiminalBackroomsApp(QMainWindow):
         # Initialize main conversation as root node
         self.right_pane.add_node('main', 'Seed', 'main')
         
-        # Status bar with modern styling
-        self.statusBar().setStyleSheet(f"""
-            QStatusBar {{
-                background-color: {COLORS['bg_dark']};
-                color: {COLORS['text_dim']};
-                border-top: 1px solid {COLORS['border']};
-                padding: 3px;
-                font-size: 11px;
-            }}
-        """)
+        # Status bar (styled by the window stylesheet in apply_dark_theme)
         self.statusBar().showMessage("Ready")
         
         # Set up input callback
@@ -1995,8 +3117,8 @@ class LiminalBackroomsApp(QMainWindow):
         self.left_pane.set_rabbithole_callback(self.branch_from_selection)
         self.left_pane.set_fork_callback(self.fork_from_selection)
         
-        # Save splitter state when it moves
-        self.splitter.splitterMoved.connect(self.save_splitter_state)
+        # Save splitter state when it moves (debounced - splitterMoved fires for every drag step)
+        self.splitter.splitterMoved.connect(lambda *_: self._splitter_save_timer.start())
     
     def handle_user_input(self, text):
         """Handle user input from the conversation pane"""
@@ -2023,16 +3145,16 @@ class LiminalBackroomsApp(QMainWindow):
         """Clear the conversation display and reset images"""
         self.left_pane.clear_conversation()
         self.conversation = []
-        self.images = []
-        self.image_paths = []
+        self.images.clear()
+        self.image_paths.clear()
     
     def display_conversation(self, conversation, branch_data=None):
         """Display the conversation in the text edit widget"""
         self.left_pane.display_conversation(conversation, branch_data)
     
-    def display_image(self, image_path):
+    def display_image(self, image_path, image_data=None):
         """Display an image in the conversation"""
-        self.left_pane.display_image(image_path)
+        self.left_pane.display_image(image_path, image_data)
     
     def export_conversation(self):
         """Export the current conversation"""
@@ -2050,6 +3172,8 @@ class LiminalBackroomsApp(QMainWindow):
     
     def apply_dark_theme(self):
         """Apply dark theme to the application"""
+        # One window-level stylesheet covers the splitter handle, status bar, field labels,
+        # checkbox and selectors too, so Qt parses a single sheet instead of one per widget
         self.setStyleSheet(f"""
             QMainWindow {{
                 background-color: {COLORS['bg_dark']};
@@ -2065,7 +3189,41 @@ class LiminalBackroomsApp(QMainWindow):
                 border: 1px solid {COLORS['border']};
                 padding: 5px;
             }}
-        """)
+            QSplitter::handle {{
+                background-color: {COLORS['border']};
+                border: 1px solid {COLORS['border_highlight']};
+                border-radius: 2px;
+            }}
+            QSplitter::handle:hover {{
+                background-color: {COLORS['accent_blue']};
+            }}
+            QStatusBar {{
+                background-color: {COLORS['bg_dark']};
+                color: {COLORS['text_dim']};
+                border-top: 1px solid {COLORS['border']};
+                padding: 3px;
+                font-size: 11px;
+            }}
+            QLabel#fieldLabel {{
+                color: {COLORS['text_dim']};
+                font-size: 12px;
+            }}
+            QCheckBox {{
+                color: {COLORS['text_normal']};
+                spacing: 5px;
+            }}
+            QCheckBox::indicator {{
+                width: 16px;
+                height: 16px;
+                border: 1px solid {COLORS['border']};
+                border-radius: 3px;
+                background-color: {COLORS['bg_light']};
+            }}
+            QCheckBox::indicator:checked {{
+                background-color: {COLORS['accent_blue']};
+                border: 1px solid {COLORS['accent_blue']};
+            }}
+        """ + COMBOBOX_STYLE)
         
         # Add specific styling for branch messages
         branch_header_format = QTextCharFormat()
@@ -2085,6 +3243,10 @@ class LiminalBackroomsApp(QMainWindow):
     def on_branch_select(self, branch_id):
         """Handle branch selection in the network view"""
         try:
+            # Nothing to do if the selection is already the displayed conversation
+            if (None if branch_id == 'main' else branch_id) == self.active_branch:
+                return
+            
             # Check if branch exists
             if branch_id == 'main':
                 # Switch to main conversation
@@ -2106,6 +3268,7 @@ class LiminalBackroomsApp(QMainWindow):
             
             # Set active branch
             self.active_branch = branch_id
+            self.touch_branch(branch_id)
             
             # Update conversation
             self.conversation = branch_data['conversation']
@@ -2145,42 +3308,42 @@ class LiminalBackroomsApp(QMainWindow):
     def create_branch(self, selected_text, branch_type="rabbithole", parent_branch=None):
         """Create a new branch in the conversation"""
         try:
+            import uuid
+
             # Generate a unique ID for the branch
             branch_id = str(uuid.uuid4())
             
             # Get parent branch ID
             parent_id = parent_branch if parent_branch else (self.active_branch if self.active_branch else 'main')
             
-            # Get current conversation
+            # Get current conversation (by reference - only the branch copy below is materialized)
             if parent_id == 'main':
                 # If parent is main, use main conversation
                 if not hasattr(self, 'main_conversation'):
                     self.main_conversation = []
-                current_conversation = self.main_conversation.copy()
+                current_conversation = self.main_conversation
             else:
                 # Otherwise, use parent branch conversation
                 parent_data = self.branch_conversations.get(parent_id)
                 if parent_data:
-                    current_conversation = parent_data['conversation'].copy()
+                    current_conversation = parent_data['conversation']
                 else:
                     current_conversation = []
             
-            # Create initial message based on branch type
-            if branch_type == 'fork':
-                initial_message = {
-                    "role": "user",
-                    "content": f"Complete this thought or sentence naturally, continuing forward from exactly this point: '{selected_text}'"
-                }
-            else:  # rabbithole
-                initial_message = {
-                    "role": "user",
-                    "content": f"Let's explore and expand upon the concept of '{selected_text}' from our previous discussion."
-                }
-            
-            # Create branch conversation with initial message
-            branch_conversation = current_conversation.copy()
+            # Create initial message based on branch type (rabbithole is the default)
+            template = BRANCH_PROMPT_TEMPLATES.get(branch_type, BRANCH_PROMPT_TEMPLATES['rabbithole'])
+            initial_message = {
+                "role": "user",
+                "content": template.format(selected_text=selected_text)
+            }
+            
+            # Create branch conversation with initial message (single copy of the parent's list)
+            branch_conversation = list(current_conversation)
             branch_conversation.append(initial_message)
             
+            # Cache the ancestor chain so path lookups don't walk parents
+            ancestors, path = self.branch_lineage(parent_id, branch_type, selected_text)
+            
             # Create branch data
             branch_data = {
                 'id': branch_id,
@@ -2190,16 +3353,19 @@ class LiminalBackroomsApp(QMainWindow):
                 'conversation': branch_conversation,
                 'turn_count': 0,
                 'created_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'history': current_conversation
+                'ancestors': ancestors,
+                'path': path,
+                # Length of the inherited prefix; the history itself is sliced lazily
+                'history_length': len(current_conversation)
             }
             
             # Store branch data
             self.branch_conversations[branch_id] = branch_data
+            self.touch_branch(branch_id)
             
             # Add node to network graph - make sure parameters are in the correct order
-            node_label = f"{branch_type.capitalize()}: {selected_text[:20]}{'...' if len(selected_text) > 20 else ''}"
-            self.right_pane.add_node(branch_id, node_label, branch_type)
-            self.right_pane.add_edge(parent_id, branch_id)
+            node_label = f"{branch_type.capitalize()}: {path[-1]}"
+            self.right_pane.add_branch_node(branch_id, node_label, branch_type, parent_id)
             
             # Set active branch to this new branch
             self.active_branch = branch_id
@@ -2221,9 +3387,58 @@ class LiminalBackroomsApp(QMainWindow):
             self.statusBar().showMessage(f"Error creating branch: {e}")
             return None
     
+    def touch_branch(self, branch_id):
+        """Mark a branch as recently used, releasing the caches of the least recently used ones past the limit"""
+        if branch_id not in self.branch_conversations:
+            return
+        self._branch_lru[branch_id] = True
+        self._branch_lru.move_to_end(branch_id)
+        while len(self._branch_lru) > MAX_WARM_BRANCHES:
+            stale_id, _ = self._branch_lru.popitem(last=False)
+            self.release_branch(stale_id)
+    
+    def release_branch(self, branch_id):
+        """Drop data derived from a cold branch; it is rebuilt on next use, the conversation is untouched"""
+        branch_data = self.branch_conversations.get(branch_id)
+        if not branch_data:
+            return
+        branch_data.pop('path_label', None)
+        self.left_pane.forget_render(branch_data['conversation'])
+    
+    def get_branch_history(self, branch_id):
+        """Return the conversation a branch inherited from its parent at creation time"""
+        branch_data = self.branch_conversations.get(branch_id)
+        if not branch_data:
+            return []
+        return branch_data['conversation'][:branch_data.get('history_length', 0)]
+    
+    def branch_lineage(self, parent_id, branch_type, selected_text):
+        """Return (ancestors, path) for a new branch, extending the parent's cached chain"""
+        parent_data = self.branch_conversations.get(parent_id) if parent_id else None
+        if parent_data:
+            ancestors = parent_data.get('ancestors', ('main',)) + (parent_id,)
+            parent_path = parent_data.get('path', ())
+        else:
+            ancestors = ('main',)
+            parent_path = ()
+        
+        if selected_text:
+            segment = _truncate(selected_text, 20)
+        else:
+            segment = branch_type.capitalize()
+        return ancestors, parent_path + (segment,)
+    
     def get_branch_path(self, branch_id):
         """Get the full path of branch names from root to the given branch"""
         try:
+            # Fast path: joined label memoized on the branch (parents never change once set)
+            branch_data = self.branch_conversations.get(branch_id)
+            if branch_data and 'path_label' in branch_data:
+                return branch_data['path_label']
+            if branch_data and 'path' in branch_data:
+                branch_data['path_label'] = ' → '.join(('Seed',) + branch_data['path'])
+                return branch_data['path_label']
+            
             path = []
             current_id = branch_id
             
@@ -2239,7 +3454,7 @@ class LiminalBackroomsApp(QMainWindow):
                 # Get a readable version of the selected text (truncated if needed)
                 selected_text = branch_data.get('selected_text', '')
                 if selected_text:
-                    display_text = f"{selected_text[:20]}{'...' if len(selected_text) > 20 else ''}"
+                    display_text = _truncate(selected_text, 20)
                     path.append(display_text)
                 else:
                     path.append(f"{branch_data.get('type', 'Branch').capitalize()}")
@@ -2259,8 +3474,7 @@ class LiminalBackroomsApp(QMainWindow):
         """Save the current splitter state to a file"""
         try:
             # Create settings directory if it doesn't exist
-            if not os.path.exists('settings'):
-                os.makedirs('settings')
+            os.makedirs('settings', exist_ok=True)
                 
             # Save splitter state to file
             with open('settings/splitter_state.json', 'w') as f:
@@ -2284,6 +3498,19 @@ class LiminalBackroomsApp(QMainWindow):
             total_width = self.width()
             self.splitter.setSizes([int(total_width * 0.7), int(total_width * 0.3)])
 
+    def changeEvent(self, event):
+        """Pause UI animations while the window is minimized"""
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.left_pane.set_animations_paused(self.isMinimized())
+            self.right_pane.network_view.set_animations_paused(self.isMinimized())
+        super().changeEvent(event)
+    
+    def closeEvent(self, event):
+        """Release pooled download connections and finish the physics kernel compile on exit"""
+        close_http_session()
+        wait_for_physics_kernel()
+        super().closeEvent(event)
+    
     def process_branch_conversation(self, branch_id):
         """Process the branch conversation using the selected models"""
         # This method will be implemented in main.py to avoid circular imports
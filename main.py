@@ -8,13 +8,14 @@ import sys
 import re
 from dotenv import load_dotenv
 from PyQt6.QtWidgets import QApplication, QMessageBox
-from PyQt6.QtCore import QThread, pyqtSignal, QObject, QRunnable, pyqtSlot, QThreadPool
+from PyQt6.QtCore import QThread, pyqtSignal, QObject, QRunnable, pyqtSlot, QThreadPool, QTimer
 
 # Load environment variables from .env file
 load_dotenv()
 
 from config import (
     TURN_DELAY,
+    MAX_WORKER_THREADS,
     AI_MODELS,
     SYSTEM_PROMPT_PAIRS,
     SHOW_CHAIN_OF_THOUGHT_IN_CONTEXT,
@@ -210,6 +211,7 @@ def ai_turn(ai_name, conversation, model, system_prompt, gui=None, is_branch=Fal
     
     # Filter out any existing system messages that might interfere
     filtered_conversation = []
+    seen_contents = set()  # Contents already kept, for O(1) duplicate checks
     for msg in conversation:
         if not isinstance(msg, dict):
             # Convert plain text to dictionary
@@ -232,15 +234,13 @@ def ai_turn(ai_name, conversation, model, system_prompt, gui=None, is_branch=Fal
             continue
             
         # Skip duplicate messages - check if this exact content exists already
-        is_duplicate = False
-        for existing in filtered_conversation:
-            if existing.get("content") == msg.get("content"):
-                is_duplicate = True
-                print(f"Skipping duplicate message: {msg.get('content')[:30]}...")
-                break
-                
-        if not is_duplicate:
-            filtered_conversation.append(msg)
+        content = msg.get("content")
+        if content in seen_contents:
+            print(f"Skipping duplicate message: {content[:30]}...")
+            continue
+        
+        seen_contents.add(content)
+        filtered_conversation.append(msg)
     
     # Process filtered conversation
     for i, msg in enumerate(filtered_conversation):
@@ -380,9 +380,11 @@ class ConversationManager:
     def __init__(self, app):
         self.app = app
         self.workers = []  # Keep track of worker threads
+        self.latest_responses = {}  # AI name -> message its last response appended, completed by its result
         
-        # Initialize the worker thread pool
+        # Initialize the worker thread pool (bounded - extra turns queue instead of spawning threads)
         self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(MAX_WORKER_THREADS)
         print(f"Conversation Manager initialized with {self.thread_pool.maxThreadCount()} threads")
         
     def initialize(self):
@@ -493,11 +495,10 @@ class ConversationManager:
         # This ensures any images generated from AI-1's response are included
         worker2.conversation = latest_conversation.copy()
         
-        # Add a small delay between turns
-        time.sleep(TURN_DELAY)
-        
+        # Add a small delay between turns - scheduled on the event loop rather than
+        # sleeping, so the GUI stays responsive while waiting
         # Start AI-2's turn - the ai_turn function will properly format the context
-        self.thread_pool.start(worker2)
+        QTimer.singleShot(int(TURN_DELAY * 1000), lambda: self.thread_pool.start(worker2))
     
     def handle_turn_completion(self, max_iterations=1):
         """Handle the completion of a full turn (both AIs)"""
@@ -677,6 +678,7 @@ class ConversationManager:
                 
                 # Add AI response to conversation
                 conversation.append(ai_message)
+                self.latest_responses[ai_name] = ai_message
                 
                 # Update the conversation display - filter out hidden messages
                 visible_conversation = [msg for msg in conversation if not msg.get('hidden', False)]
@@ -688,6 +690,7 @@ class ConversationManager:
             
             # Add AI response to main conversation
             self.app.main_conversation.append(ai_message)
+            self.latest_responses[ai_name] = ai_message
             
             # Update the conversation display - filter out hidden messages
             visible_conversation = [msg for msg in self.app.main_conversation if not msg.get('hidden', False)]
@@ -700,6 +703,10 @@ class ConversationManager:
         """Handle the complete AI result"""
         print(f"Result received from {ai_name}")
         
+        # Only the message this AI's response just appended is updated - earlier ones may be
+        # inherited dicts shared with the parent and sibling branches
+        target_message = self.latest_responses.pop(ai_name, None)
+        
         # Determine which conversation to update
         conversation = self.app.main_conversation
         if self.app.active_branch:
@@ -713,17 +720,11 @@ class ConversationManager:
             if response_content and len(response_content.strip()) > 20:
                 if hasattr(self.app.left_pane.control_panel, 'auto_image_checkbox') and self.app.left_pane.control_panel.auto_image_checkbox.isChecked():
                     self.app.left_pane.append_text("\nGenerating an image based on this response...\n", "system")
-                    self.generate_and_display_image(response_content, ai_name)
+                    self.generate_and_display_image(response_content, ai_name, target_message)
 
         # Display result content
         if isinstance(result, dict):
             # Persist reasoning and presentation metadata on the stored message
-            target_message = None
-            for msg in reversed(conversation):
-                if msg.get("role") == "assistant" and msg.get("ai_name") == ai_name:
-                    target_message = msg
-                    break
-
             if target_message:
                 final_content = result.get(
                     "content",
@@ -777,8 +778,8 @@ class ConversationManager:
         else:
             self.app.left_pane.display_conversation(visible_conversation)
             
-    def generate_and_display_image(self, text, ai_name):
-        """Generate an image based on text and display it in the UI"""
+    def generate_and_display_image(self, text, ai_name, message=None):
+        """Generate an image based on text and display it in the UI, recording it on message"""
         # Create a prompt for the image generation
         # Extract the first 100-300 characters to use as the image prompt
         max_length = min(300, len(text))
@@ -801,19 +802,16 @@ class ConversationManager:
                 branch_data = self.app.branch_conversations[branch_id]
                 conversation = branch_data['conversation']
             
-            # Find the most recent message from this AI
-            for msg in reversed(conversation):
-                if msg.get("ai_name") == ai_name and msg.get("role") == "assistant":
-                    # Add the image path to the message
-                    msg["generated_image_path"] = image_path
-                    print(f"Added generated image {image_path} to message from {ai_name}")
-                    break
+            # Add the image path to the message the image was generated from
+            if message is not None:
+                message["generated_image_path"] = image_path
+                print(f"Added generated image {image_path} to message from {ai_name}")
             
             # Update the conversation HTML to include the new image
             self.update_conversation_html(conversation)
             
-            # Run on the main thread
-            self.app.left_pane.display_image(image_path)
+            # Run on the main thread - decode the bytes we already have instead of re-reading the file
+            self.app.left_pane.display_image(image_path, result.get("image_bytes"))
             
             # Notify the user
             self.app.left_pane.append_text(f"\nGenerated image saved to {image_path}\n", "system")
@@ -888,11 +886,11 @@ class ConversationManager:
             # Branching from main conversation
             parent_conversation = self.app.main_conversation
         
-        # Copy ALL previous context except branch indicators
+        # Share ALL previous context except branch indicators - results only update the message
+        # their response appended (see on_ai_result_received), so siblings reference one copy
         for msg in parent_conversation:
             if not msg.get('_type') == 'branch_indicator':
-                # Copy the message excluding branch indicators
-                branch_conversation.append(msg.copy())
+                branch_conversation.append(msg)
         
         # Add the branch indicator at the END (not beginning) 
         branch_message = {
@@ -903,12 +901,17 @@ class ConversationManager:
         branch_conversation.append(branch_message)
         
         # Store the branch data
+        ancestors, path = self.app.branch_lineage(parent_id, 'rabbithole', selected_text)
         self.app.branch_conversations[branch_id] = {
             'type': 'rabbithole',
             'selected_text': selected_text,
             'conversation': branch_conversation,
-            'parent': parent_id
+            'parent': parent_id,
+            'history_length': len(branch_conversation) - 1,  # inherited prefix, before the indicator
+            'ancestors': ancestors,
+            'path': path
         }
+        self.app.touch_branch(branch_id)
         
         # Activate the branch
         self.app.active_branch = branch_id
@@ -919,8 +922,7 @@ class ConversationManager:
         
         # Add node to network graph
         parent_node = parent_id if parent_id else 'main'
-        self.app.right_pane.add_node(branch_id, f'🐇 {selected_text[:15]}...', 'rabbithole')
-        self.app.right_pane.add_edge(parent_node, branch_id)
+        self.app.right_pane.add_branch_node(branch_id, f'🐇 {selected_text[:15]}...', 'rabbithole', parent_node)
         
         # Process the branch conversation
         self.process_branch_input(selected_text)
@@ -950,30 +952,34 @@ class ConversationManager:
         
         # For fork branches, only include context UP TO the selected text
         truncate_idx = None
+        truncate_pos = -1
         msg_with_text = None
         
-        # First pass: find the message containing the selected text
+        # First pass: find the message containing the selected text (and where it occurs)
         for i, msg in enumerate(parent_conversation):
-            if msg.get('role') in ['user', 'assistant'] and selected_text in msg.get('content', ''):
-                truncate_idx = i
-                msg_with_text = msg
-                break
+            content = msg.get('content', '')
+            if msg.get('role') in ['user', 'assistant'] and isinstance(content, str):
+                truncate_pos = content.find(selected_text)
+                if truncate_pos != -1:
+                    truncate_idx = i
+                    msg_with_text = msg
+                    break
         
         # If we didn't find the selected text, include all messages
         # This can happen with multi-line selections that span messages
         if truncate_idx is None:
             print(f"Warning: Selected text not found in any single message, including all context")
-            # Copy all messages except branch indicators
+            # Share all messages except branch indicators (see rabbithole_callback)
             for msg in parent_conversation:
                 if not msg.get('_type') == 'branch_indicator':
-                    branch_conversation.append(msg.copy())
+                    branch_conversation.append(msg)
         else:
             # We found the message with the selected text, proceed as normal
             # Second pass: add all messages up to the truncate point
             for i, msg in enumerate(parent_conversation):
                 # Always include system messages that aren't branch indicators
                 if msg.get('role') == 'system' and not msg.get('_type') == 'branch_indicator':
-                    branch_conversation.append(msg.copy())
+                    branch_conversation.append(msg)
                     continue
                 
                 # For non-system messages, only include up to truncate point
@@ -983,11 +989,10 @@ class ConversationManager:
                         # This is the message containing the selected text
                         # Truncate the message at the selected text if possible
                         content = msg.get('content', '')
-                        if selected_text in content:
-                            # Find where the selected text occurs
-                            pos = content.find(selected_text)
+                        if truncate_pos != -1:
                             # Include everything up to and including the selected text
-                            truncated_content = content[:pos + len(selected_text)]
+                            # (position found in the first pass)
+                            truncated_content = content[:truncate_pos + len(selected_text)]
                             
                             # Create a modified copy of the message with truncated content
                             modified_msg = msg.copy()
@@ -995,10 +1000,10 @@ class ConversationManager:
                             branch_conversation.append(modified_msg)
                         else:
                             # If we can't find the text (unlikely), just add the whole message
-                            branch_conversation.append(msg.copy())
+                            branch_conversation.append(msg)
                     else:
-                        # Regular message before the truncate point
-                        branch_conversation.append(msg.copy())
+                        # Regular message before the truncate point (shared, not copied)
+                        branch_conversation.append(msg)
         
         # Add the branch indicator as the last message
         branch_message = {
@@ -1012,12 +1017,17 @@ class ConversationManager:
         fork_instruction = "..."
         
         # Store the branch data
+        ancestors, path = self.app.branch_lineage(parent_id, 'fork', selected_text)
         self.app.branch_conversations[branch_id] = {
             'type': 'fork',
             'selected_text': selected_text,
             'conversation': branch_conversation,
-            'parent': parent_id
+            'parent': parent_id,
+            'history_length': len(branch_conversation) - 1,  # inherited prefix, before the indicator
+            'ancestors': ancestors,
+            'path': path
         }
+        self.app.touch_branch(branch_id)
         
         # Activate the branch
         self.app.active_branch = branch_id
@@ -1028,8 +1038,7 @@ class ConversationManager:
         
         # Add node to network graph
         parent_node = parent_id if parent_id else 'main'
-        self.app.right_pane.add_node(branch_id, f'🍴 {selected_text[:15]}...', 'fork')
-        self.app.right_pane.add_edge(parent_node, branch_id)
+        self.app.right_pane.add_branch_node(branch_id, f'🍴 {selected_text[:15]}...', 'fork', parent_node)
         
         # Process the branch conversation with the proper instruction but mark it as hidden
         self.process_branch_input_with_hidden_instruction(fork_instruction)
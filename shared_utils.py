@@ -1581,6 +1581,7 @@ def generate_image_from_text(text, model="gpt-image-1"):
         return {
             "success": True,
             "image_path": str(image_path),
+            "image_bytes": image_bytes,
             "timestamp": timestamp
         }
     except Exception as e: